@@ -0,0 +1,34 @@
+from multiprocessing import Pool
+from solver import UnsolvableBoard, resolucao, to_grid, validate_board
+
+def _solve(job):
+    # Devolve (índice, caminho, erro); com erro o caminho é None e a
+    # mensagem segue as da linha de comando
+    index, board, algoritmo, heuristica = job
+    try:
+        flat = list(board)
+        if flat and isinstance(flat[0], (list, tuple)):
+            flat = [tile for row in flat for tile in row]
+        validate_board(flat)
+        grid = to_grid(flat)
+    except (IndexError, TypeError, ValueError) as e:
+        return index, None, f"tabuleiro inválido: {e}"
+    try:
+        return index, resolucao(grid, algoritmo, heuristica), None
+    except UnsolvableBoard:
+        return index, None, "sem solução"
+    except ValueError as e:
+        return index, None, str(e)
+
+def solve_many(boards, algoritmo="A*", heuristica="Manhattan", processes=None, chunksize=16, ordered=True):
+    # Gera (índice, caminho, erro) para cada tabuleiro; com ordered=False os
+    # resultados saem na ordem em que ficam prontos.
+    jobs = ((index, board, algoritmo, heuristica) for index, board in enumerate(boards))
+    if processes == 1:
+        yield from map(_solve, jobs)
+        return
+    with Pool(processes) as pool:
+        if ordered:
+            yield from pool.imap(_solve, jobs, chunksize)
+        else:
+            yield from pool.imap_unordered(_solve, jobs, chunksize)
@@ -0,0 +1,127 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from generator import boards_at_depth
+from solver import SearchStats, heuristic_names, solve
+
+HEURISTICS = heuristic_names(3)
+COMBINATIONS = (
+    [("A*", heuristica) for heuristica in HEURISTICS]
+    + [("Busca Gulosa", heuristica) for heuristica in HEURISTICS]
+    + [("Largura", None), ("Largura Bidirecional", None), ("Tabela", None), ("IDA*", None), ("A* Anytime", None)]
+)
+DEPTHS = [8, 12, 16, 20, 24, 28]
+# Métricas em que um valor maior é pior
+REGRESSION_METRICS = ["mean_time", "mean_expanded", "mean_excess"]
+# Diferenças de tempo abaixo disso são ruído de medição
+TIME_NOISE = 0.001
+
+def make_corpus(depths, count, seed):
+    # Sorteia tabuleiros com distância ótima exata usando a tabela do 3x3
+    rng = random.Random(seed)
+    corpus = []
+    for depth in depths:
+        corpus.extend((depth, board) for board in boards_at_depth(depth, count, rng))
+    return corpus
+
+def run_combination(corpus, algoritmo, heuristica, memory=False):
+    times = []
+    expanded = []
+    peak_memory = 0
+    optimal = 0
+    excess = []
+    for depth, board in corpus:
+        stats = SearchStats(memory=memory)
+        started = time.perf_counter()
+        moves = solve(board, algoritmo, heuristica, stats)
+        times.append(time.perf_counter() - started)
+        expanded.append(stats.expanded)
+        peak_memory = max(peak_memory, stats.peak_memory or 0)
+        length = len(moves) if moves is not None else None
+        if length == depth:
+            optimal += 1
+        if length is not None:
+            excess.append(length - depth)
+    return {
+        "algoritmo": algoritmo,
+        "heuristica": heuristica,
+        "boards": len(corpus),
+        "mean_time": sum(times) / len(times),
+        "max_time": max(times),
+        "mean_expanded": sum(expanded) / len(expanded),
+        "max_expanded": max(expanded),
+        "peak_memory": peak_memory if memory else None,
+        "optimal": optimal / len(corpus),
+        "mean_excess": sum(excess) / len(excess) if excess else None,
+    }
+
+def combination_key(result):
+    return f"{result['algoritmo']}/{result['heuristica']}"
+
+def compare(results, baseline, tolerance):
+    previous = {combination_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = previous.get(combination_key(result))
+        if old is None:
+            continue
+        for metric in REGRESSION_METRICS:
+            before, after = old.get(metric), result.get(metric)
+            if before is None or after is None:
+                continue
+            if metric == "mean_time" and after - before < TIME_NOISE:
+                continue
+            if after > before * (1 + tolerance) and after > before:
+                regressions.append((combination_key(result), metric, before, after))
+        if result["optimal"] < old["optimal"]:
+            regressions.append((combination_key(result), "optimal", old["optimal"], result["optimal"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara os algoritmos e heurísticas do solver.")
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--profundidades", type=int, nargs="+", default=DEPTHS)
+    parser.add_argument("--quantidade", type=int, default=5, help="tabuleiros por profundidade")
+    parser.add_argument("--algoritmos", nargs="+", help="roda só estes algoritmos")
+    parser.add_argument("--memoria", action="store_true", help="mede o pico de memória (mais lento)")
+    parser.add_argument("--saida", default="bench_output.json")
+    parser.add_argument("--baseline", help="resultado anterior para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="piora relativa aceita (padrão: 10%%)")
+    args = parser.parse_args(argv)
+
+    corpus = make_corpus(args.profundidades, args.quantidade, args.seed)
+    results = []
+    for algoritmo, heuristica in COMBINATIONS:
+        if args.algoritmos and algoritmo not in args.algoritmos:
+            continue
+        result = run_combination(corpus, algoritmo, heuristica, args.memoria)
+        results.append(result)
+        print(f"{combination_key(result):40} {result['mean_time'] * 1000:9.2f} ms {result['mean_expanded']:11.1f} nós  ótimo {result['optimal']:.0%}")
+
+    report = {
+        "seed": args.seed,
+        "depths": args.profundidades,
+        "count": args.quantidade,
+        "python": platform.python_version(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(args.saida, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (baseline["seed"], baseline["depths"], baseline["count"]) != (args.seed, args.profundidades, args.quantidade):
+            print("Aviso: a baseline usou outro corpus; a comparação pode não fazer sentido.")
+        regressions = compare(results, baseline, args.tolerancia)
+        for key, metric, before, after in regressions:
+            print(f"REGRESSÃO {key}: {metric} {before:.4g} -> {after:.4g}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
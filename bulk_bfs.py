@@ -0,0 +1,137 @@
+from solver import goal_code_for, goal_for, neighbor_table
+
+# Motor de BFS por camadas com NumPy: cada camada é um array de estados
+# empacotados e todos os vizinhos são gerados de uma vez, um array por
+# direção. Sem NumPy as tabelas continuam sendo geradas em Python puro.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+UNKNOWN = 255
+
+def available():
+    return np is not None
+
+def distinct(values):
+    # Índices de uma ocorrência de cada valor. Ordenar e comparar vizinhos
+    # sai bem mais barato que np.unique nos arrays grandes.
+    order = np.argsort(values)
+    ordered = values[order]
+    keep = np.empty(len(values), dtype=bool)
+    keep[:1] = True
+    np.not_equal(ordered[1:], ordered[:-1], out=keep[1:])
+    return order[keep]
+
+def neighbor_arrays(n):
+    # targets[d][vazio] = casa vizinha na direção d, ou -1 se sair do tabuleiro
+    moves = neighbor_table(n)
+    targets = np.full((4, n * n), -1, dtype=np.int64)
+    for zero, neighbors in moves.items():
+        for d, delta in enumerate((-n, n, -1, 1)):
+            if zero + delta in neighbors:
+                targets[d, zero] = zero + delta
+    return targets
+
+def expand_packed(codes, zeros, targets):
+    # Move o vazio em todas as direções válidas: a peça vizinha troca de
+    # casa com o vazio com dois XOR no código empacotado.
+    children, child_zeros = [], []
+    for d in range(4):
+        neighbor = targets[d][zeros]
+        valid = neighbor >= 0
+        code, zero, neighbor = codes[valid], zeros[valid], neighbor[valid]
+        tile = (code >> (4 * neighbor).astype(np.uint64)) & np.uint64(15)
+        children.append(code ^ (tile << (4 * neighbor).astype(np.uint64)) ^ (tile << (4 * zero).astype(np.uint64)))
+        child_zeros.append(neighbor)
+    return np.concatenate(children), np.concatenate(child_zeros)
+
+def rank_3x3(codes, zeros):
+    # Mesmo índice de distance_table.rank: vazio * 8!/2 + Lehmer(peças) // 2.
+    # O vazio é menor que qualquer peça, então sai da contagem à parte.
+    from distance_table import FACTORIALS, HALF_PERMS
+    tiles = [((codes >> np.uint64(4 * i)) & np.uint64(15)).astype(np.int64) for i in range(9)]
+    weights = np.array(FACTORIALS[::-1], dtype=np.int64)
+    code = np.zeros(len(codes), dtype=np.int64)
+    for i in range(9):
+        smaller = sum((tiles[j] < tiles[i]).astype(np.int64) for j in range(i + 1, 9))
+        smaller -= zeros > i
+        position = i - (zeros < i)
+        code += np.where(tiles[i] > 0, smaller * weights[np.clip(position, 0, 7)], 0)
+    return zeros * HALF_PERMS + code // 2
+
+def distance_table_3x3():
+    # BFS a partir do objetivo; a própria tabela de distâncias é o conjunto
+    # de visitados (UNKNOWN = ainda não visto).
+    from distance_table import STATES
+    table = np.full(STATES, UNKNOWN, dtype=np.uint8)
+    targets = neighbor_arrays(3)
+    codes = np.array([goal_code_for(3)], dtype=np.uint64)
+    zeros = np.array([goal_for(3).index(0)], dtype=np.int64)
+    table[rank_3x3(codes, zeros)] = 0
+    depth = 0
+    while len(codes):
+        depth += 1
+        codes, zeros = expand_packed(codes, zeros, targets)
+        ranks = rank_3x3(codes, zeros)
+        fresh = table[ranks] == UNKNOWN
+        codes, zeros, ranks = codes[fresh], zeros[fresh], ranks[fresh]
+        keep = distinct(ranks)
+        codes, zeros = codes[keep], zeros[keep]
+        table[ranks[keep]] = depth
+    return bytearray(table.tobytes())
+
+def expand_pattern(states, k, targets):
+    # Estados no índice denso de pattern_db (4 bits por peça do padrão e o
+    # vazio nos 4 bits de cima). Devolve os filhos de custo 0 (o vazio troca
+    # com uma peça fora do padrão) e os de custo 1 (troca com uma do padrão).
+    blank_shift = 4 * k
+    blanks = states >> blank_shift
+    base = states & ((1 << blank_shift) - 1)
+    slots = [(states >> (4 * slot)) & 15 for slot in range(k)]
+    free, paid = [], []
+    for d in range(4):
+        neighbor = targets[d][blanks]
+        valid = neighbor >= 0
+        shift = np.zeros(len(states), dtype=np.int64)
+        hit = np.zeros(len(states), dtype=bool)
+        for slot, position in enumerate(slots):
+            match = position == neighbor
+            shift += np.where(match, (blanks - neighbor) << (4 * slot), 0)
+            hit |= match
+        child = base + shift + (neighbor << blank_shift)
+        free.append(child[valid & ~hit])
+        paid.append(child[valid & hit])
+    return np.concatenate(free), np.concatenate(paid)
+
+def pattern_table(pattern, n):
+    # BFS 0-1 por níveis: cada nível de custo é fechado pelos movimentos de
+    # custo 0 antes de gerar o próximo com os movimentos de custo 1.
+    k = len(pattern)
+    blank_shift = 4 * k
+    goal = goal_for(n)
+    targets = neighbor_arrays(n)
+    start = goal.index(0) << blank_shift
+    for slot, tile in enumerate(pattern):
+        start |= goal.index(tile) << (4 * slot)
+
+    dist = np.full(1 << (blank_shift + 4), UNKNOWN, dtype=np.uint8)
+    current = np.array([start], dtype=np.int64)
+    dist[current] = 0
+    cost = 0
+    while len(current):
+        frontier = current
+        paid = []
+        while len(frontier):
+            free, more = expand_pattern(frontier, k, targets)
+            paid.append(more)
+            frontier = free[dist[free] == UNKNOWN]
+            frontier = frontier[distinct(frontier)]
+            dist[frontier] = cost
+        cost += 1
+        current = np.concatenate(paid)
+        current = current[dist[current] == UNKNOWN]
+        current = current[distinct(current)]
+        dist[current] = cost
+    # O valor de um arranjo das peças é o menor entre as posições do vazio
+    return bytearray(dist.reshape(16, -1).min(axis=0).tobytes())
\ No newline at end of file
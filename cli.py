@@ -0,0 +1,138 @@
+import argparse
+import csv
+import json
+import sys
+import time
+from replay import iter_replays, write_replay
+from solution_cache import SolutionCache
+from solver import BudgetExhausted, SearchStats, UnsolvableBoard, solve, validate_board
+
+MOVE_LETTERS = "UDLR"
+
+def parse_board(value):
+    if isinstance(value, dict):
+        value = value["board"]
+    if value and isinstance(value[0], list):
+        value = sum(value, [])
+    return [int(tile) for tile in value]
+
+class InvalidLine(ValueError):
+    # Linha da entrada que não pôde ser lida; vira um erro na saída em vez
+    # de interromper o lote
+    def __init__(self, line, message):
+        super().__init__(message)
+        self.line = line
+
+def read_jsonl(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield InvalidLine(line, f"JSON inválido: {e}")
+
+def read_csv(stream):
+    for number, row in enumerate(csv.reader(stream)):
+        row = [cell.strip() for cell in row if cell.strip()]
+        if not row:
+            continue
+        if all(cell.isdigit() for cell in row):
+            yield row
+        elif number > 0:
+            # Só a primeira linha pode ser cabeçalho
+            yield InvalidLine(",".join(row), "valores não numéricos")
+
+def solve_line(value, algoritmo, heuristica, cache=None, full_stats=False, time_budget=None, node_budget=None):
+    if isinstance(value, InvalidLine):
+        return {"input": value.line, "error": f"tabuleiro inválido: {value}"}
+    try:
+        board = parse_board(value)
+        validate_board(board)
+    except (KeyError, TypeError, ValueError) as e:
+        return {"input": value, "error": f"tabuleiro inválido: {e}"}
+    stats = SearchStats(timing=full_stats, memory=full_stats)
+    start_time = time.perf_counter()
+    try:
+        moves = solve(board, algoritmo, heuristica, stats, cache, time_budget, node_budget)
+    except UnsolvableBoard:
+        return {"board": board, "solved": False, "error": "sem solução"}
+    except BudgetExhausted:
+        return {"board": board, "solved": False, "error": "orçamento esgotado", "nodes": stats.expanded}
+    except ValueError as e:
+        return {"board": board, "error": str(e)}
+    result = {
+        "board": board,
+        "solved": moves is not None,
+        "nodes": stats.expanded,
+        "time": round(time.perf_counter() - start_time, 6),
+    }
+    if moves is not None:
+        result["moves"] = "".join(MOVE_LETTERS[move] for move in moves)
+        result["length"] = len(moves)
+    if stats.bound is not None:
+        result["bound"] = stats.bound
+    if full_stats:
+        result["stats"] = stats.as_dict()
+    return result
+
+def play_replays(path, output):
+    # Reproduz os replays gravados, um estado por linha, sem carregar o arquivo inteiro
+    with open(path, "rb") as f:
+        for index, replay in enumerate(iter_replays(f)):
+            for step, state in enumerate(replay.states()):
+                output.write(json.dumps({"replay": index, "step": step, "board": state}) + "\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve tabuleiros do 8-Puzzle sem interface gráfica.")
+    parser.add_argument("arquivo", nargs="?", help="arquivo .jsonl ou .csv (padrão: stdin)")
+    parser.add_argument("--formato", choices=["jsonl", "csv"], help="formato da entrada")
+    parser.add_argument("--algoritmo", default="A*")
+    parser.add_argument("--heuristica", default="Manhattan")
+    parser.add_argument("--saida", help="arquivo JSONL de saída (padrão: stdout)")
+    parser.add_argument("--cache", help="arquivo para guardar soluções entre execuções")
+    parser.add_argument("--tempo-limite", type=float, help="segundos por tabuleiro (A* Anytime devolve a melhor solução até lá)")
+    parser.add_argument("--limite-nos", type=int, help="nós expandidos por tabuleiro")
+    parser.add_argument("--estatisticas", action="store_true", help="inclui as estatísticas completas da busca")
+    parser.add_argument("--salvar-replays", help="grava as soluções encontradas num arquivo de replay")
+    parser.add_argument("--replay", help="reproduz um arquivo de replay em vez de resolver")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        output = open(args.saida, "w") if args.saida else sys.stdout
+        try:
+            play_replays(args.replay, output)
+        finally:
+            if args.saida:
+                output.close()
+        return
+
+    formato = args.formato
+    if formato is None:
+        formato = "csv" if args.arquivo and args.arquivo.lower().endswith(".csv") else "jsonl"
+
+    source = open(args.arquivo, newline="") if args.arquivo else sys.stdin
+    output = open(args.saida, "w") if args.saida else sys.stdout
+    cache = SolutionCache(path=args.cache) if args.cache else None
+    replays = open(args.salvar_replays, "wb") if args.salvar_replays else None
+    try:
+        reader = read_csv(source) if formato == "csv" else read_jsonl(source)
+        for value in reader:
+            result = solve_line(value, args.algoritmo, args.heuristica, cache, args.estatisticas, args.tempo_limite, args.limite_nos)
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+            if replays is not None and "moves" in result:
+                write_replay(replays, result["board"], [MOVE_LETTERS.index(letter) for letter in result["moves"]])
+    finally:
+        if cache is not None:
+            cache.save()
+        if replays is not None:
+            replays.close()
+        if args.arquivo:
+            source.close()
+        if args.saida:
+            output.close()
+
+if __name__ == "__main__":
+    main()
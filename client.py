@@ -0,0 +1,40 @@
+import json
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+# Cliente do servidor de soluções (server.py). Só usa a biblioteca padrão,
+# então quem chama não paga a importação do solver nem a carga das tabelas.
+HOST = "127.0.0.1"
+PORT = 8765
+
+class SolverServiceError(Exception):
+    pass
+
+class SolverClient:
+    def __init__(self, host=HOST, port=PORT, timeout=60):
+        self.url = f"http://{host}:{port}"
+        self.timeout = timeout
+
+    def request(self, path, payload=None):
+        data = None if payload is None else json.dumps(payload).encode()
+        request = Request(self.url + path, data=data, headers={"Content-Type": "application/json"})
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except HTTPError as e:
+            raise SolverServiceError(f"{e.code}: {e.read().decode(errors='replace')}") from e
+
+    def solve(self, board, algoritmo="A*", heuristica="Manhattan", time_budget=None, node_budget=None):
+        # Mesmo formato de resposta da linha de comando (cli.solve_line)
+        payload = {"board": board, "algoritmo": algoritmo, "heuristica": heuristica}
+        if time_budget is not None:
+            payload["tempo_limite"] = time_budget
+        if node_budget is not None:
+            payload["limite_nos"] = node_budget
+        return self.request("/resolver", payload)
+
+    def health(self):
+        return self.request("/saude")
+
+    def metrics(self):
+        return self.request("/metricas")
\ No newline at end of file
@@ -0,0 +1,89 @@
+from collections import deque
+import bulk_bfs
+import table_file
+from solver import GOAL, GOAL_CODE, NEIGHBORS, move_blank, pack, unpack
+
+TABLE_NAME = "distancias_3x3"
+
+# 9 posições do vazio x 8!/2 arranjos pares das peças = 181440 estados solucionáveis
+HALF_PERMS = 20160
+STATES = 9 * HALF_PERMS
+UNKNOWN = 255
+
+FACTORIALS = [1, 1, 2, 6, 24, 120, 720, 5040]
+
+def lehmer(tiles):
+    code = 0
+    inversions = 0
+    for i, tile in enumerate(tiles):
+        smaller = 0
+        for other in tiles[i + 1:]:
+            if other < tile:
+                smaller += 1
+        code += smaller * FACTORIALS[len(tiles) - 1 - i]
+        inversions += smaller
+    return code, inversions
+
+def rank(state):
+    # Na ordem lexicográfica as permutações 2k e 2k+1 têm paridades opostas,
+    # então k identifica a única permutação par do par.
+    code, _ = lehmer([tile for tile in state if tile])
+    return state.index(0) * HALF_PERMS + code // 2
+
+def unlehmer(code, values):
+    values = sorted(values)
+    tiles = []
+    for i in range(len(values) - 1, -1, -1):
+        digit, code = divmod(code, FACTORIALS[i])
+        tiles.append(values.pop(digit))
+    return tiles
+
+def unrank(index):
+    zero, half = divmod(index, HALF_PERMS)
+    tiles = unlehmer(2 * half, range(1, 9))
+    if lehmer(tiles)[1] % 2:
+        tiles = unlehmer(2 * half + 1, range(1, 9))
+    tiles.insert(zero, 0)
+    return tiles
+
+def build_table():
+    if bulk_bfs.available():
+        return bulk_bfs.distance_table_3x3()
+    table = bytearray([UNKNOWN]) * STATES
+    table[rank(GOAL)] = 0
+    frontier = deque([(GOAL_CODE, GOAL.index(0), 0)])
+    seen = {GOAL_CODE}
+    while frontier:
+        code, zero, depth = frontier.popleft()
+        for neighbor, _ in NEIGHBORS[zero]:
+            child = move_blank(code, zero, neighbor)
+            if child not in seen:
+                seen.add(child)
+                table[rank(unpack(child))] = depth + 1
+                frontier.append((child, neighbor, depth + 1))
+    return table
+
+def load_table():
+    return table_file.load(TABLE_NAME, 3, build_table)
+
+def distance(state):
+    return load_table()[rank(state)]
+
+def packed_distance(code):
+    return load_table()[rank(unpack(code))]
+
+def descend(state):
+    # Só recebe estados solucionáveis: solve confere a paridade antes
+    table = load_table()
+    code = pack(state)
+    zero = state.index(0)
+    depth = table[rank(state)]
+    moves = []
+    while depth:
+        for neighbor, move in NEIGHBORS[zero]:
+            child = move_blank(code, zero, neighbor)
+            if table[rank(unpack(child))] == depth - 1:
+                code, zero, depth = child, neighbor, depth - 1
+                moves.append(move)
+                break
+    return moves
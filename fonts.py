@@ -0,0 +1,43 @@
+import pygame
+from collections import OrderedDict
+
+MAX_CACHED_TEXTS = 512
+
+_fonts = {}
+_rendered = OrderedDict()
+
+def get_font(size):
+    # pygame.font.Font(None, size) lê a fonte do disco a cada chamada
+    font = _fonts.get(size)
+    if font is None:
+        font = _fonts[size] = pygame.font.Font(None, size)
+    return font
+
+def wrap_text(font, text, max_width):
+    words = text.split(' ')
+    lines = []
+    line = ""
+    for word in words:
+        test_line = line + word + " "
+        if font.size(test_line)[0] > max_width:
+            lines.append(line)
+            line = word + " "
+        else:
+            line = test_line
+    lines.append(line)
+    return [l.strip() for l in lines]
+
+def render_lines(text, size, color, max_width=None):
+    # Superfícies já renderizadas, uma por linha, com descarte LRU
+    key = (text, size, tuple(color), max_width)
+    surfaces = _rendered.get(key)
+    if surfaces is not None:
+        _rendered.move_to_end(key)
+        return surfaces
+    font = get_font(size)
+    lines = wrap_text(font, text, max_width) if max_width else [text]
+    surfaces = [font.render(line, True, color) for line in lines]
+    _rendered[key] = surfaces
+    if len(_rendered) > MAX_CACHED_TEXTS:
+        _rendered.popitem(last=False)
+    return surfaces
@@ -0,0 +1,53 @@
+import random
+from array import array
+import distance_table
+from solver import goal_state, is_solvable, neighbors_for
+
+_depth_index = None
+
+def random_board(n=3, rng=random):
+    # Permutação uniforme; se cair na metade sem solução, trocar as duas
+    # primeiras peças leva a uma permutação com solução (e é uma bijeção).
+    board = list(range(n * n))
+    rng.shuffle(board)
+    if not is_solvable(board):
+        i, j = [position for position, tile in enumerate(board) if tile][:2]
+        board[i], board[j] = board[j], board[i]
+    return board
+
+def depth_index():
+    # depth_index()[d] = índices (rank) de todos os estados 3x3 a d movimentos do objetivo
+    global _depth_index
+    if _depth_index is None:
+        index = {}
+        for rank, depth in enumerate(distance_table.load_table()):
+            if depth not in index:
+                index[depth] = array("I")
+            index[depth].append(rank)
+        _depth_index = index
+    return _depth_index
+
+def board_at_depth(depth, rng=random):
+    ranks = depth_index().get(depth)
+    if not ranks:
+        raise ValueError(f"nenhum estado 3x3 está a {depth} movimentos do objetivo")
+    return distance_table.unrank(rng.choice(ranks))
+
+def boards_at_depth(depth, count, rng=random):
+    ranks = depth_index().get(depth)
+    if not ranks:
+        raise ValueError(f"nenhum estado 3x3 está a {depth} movimentos do objetivo")
+    return [distance_table.unrank(rank) for rank in rng.sample(ranks, min(count, len(ranks)))]
+
+def random_walk(n, steps, rng=random):
+    # Embaralha sem desfazer o movimento anterior
+    board = goal_state(n)
+    neighbors = neighbors_for(n)
+    blank = board.index(0)
+    previous = -1
+    for _ in range(steps):
+        options = [(neighbor, move) for neighbor, move in neighbors[blank] if move != previous ^ 1]
+        neighbor, previous = rng.choice(options)
+        board[blank], board[neighbor] = board[neighbor], 0
+        blank = neighbor
+    return board
@@ -0,0 +1,61 @@
+import os
+import queue
+import threading
+from collections import OrderedDict
+import pygame
+
+MAX_CACHED_IMAGES = 8
+
+class TileImageLoader:
+    # Decodifica e recorta imagens numa thread; o laço do jogo pega o
+    # resultado com poll() quando estiver pronto.
+    def __init__(self, max_entries=MAX_CACHED_IMAGES):
+        self.max_entries = max_entries
+        self.cache = OrderedDict()
+        self.results = queue.Queue()
+        self.latest = None
+
+    def request(self, path, tile_size, grid_size):
+        key = (path, os.path.getmtime(path), tile_size, grid_size)
+        self.latest = key
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.results.put((key, self.cache[key], None))
+            return
+        threading.Thread(target=self.worker, args=(key,), daemon=True).start()
+
+    def worker(self, key):
+        path, _, tile_size, grid_size = key
+        try:
+            image = pygame.image.load(path)
+            image = pygame.transform.scale(image, (tile_size * grid_size, tile_size * grid_size))
+        except (pygame.error, OSError, ValueError) as e:
+            self.results.put((key, None, e))
+            return
+        self.results.put((key, image, None))
+
+    def poll(self):
+        # Devolve (tiles, erro) do pedido mais recente, ou None se ainda não há nada
+        while True:
+            try:
+                key, result, error = self.results.get_nowait()
+            except queue.Empty:
+                return None
+            if key != self.latest:
+                continue
+            if error is not None:
+                return None, error
+            if isinstance(result, pygame.Surface):
+                result = self.slice(result.convert(), key[2], key[3])
+                self.cache[key] = result
+                self.cache.move_to_end(key)
+                while len(self.cache) > self.max_entries:
+                    self.cache.popitem(last=False)
+            return result, None
+
+    @staticmethod
+    def slice(image, tile_size, grid_size):
+        return [
+            [image.subsurface(pygame.Rect(col * tile_size, row * tile_size, tile_size, tile_size)) for col in range(grid_size)]
+            for row in range(grid_size)
+        ]
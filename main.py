@@ -2,49 +2,44 @@ import pygame
 import random
 import time
 import os
+import threading
 import tkinter as tk
 from tkinter import filedialog
 from settings import *
-from solver import resolucao
+from fonts import render_lines
+from images import TileImageLoader
+from profiler import FrameProfiler
+from solver import ALGORITHMS, BudgetExhausted, SearchCancelled, SearchStats, heuristic_names, iter_states, neighbors_for, solve
+from replay import ReplayError, load_replay, save_replay
+from solution_cache import SolutionCache
 
 solving_started = False
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SCORE_FILE_PATH = os.path.join(BASE_DIR, "high_score.txt")
 CONFIGURACOES = os.path.join(BASE_DIR, "imgs", "configuracao.png")
-
-ALGORITHMS = ["A*", "Busca Gulosa", "Largura"]
-HEURISTICS = ["Manhattan", "Distância Euclidiana"]
+CACHE_FILE_PATH = os.path.join(BASE_DIR, "solucoes_cache.json")
+SOLUTION_FILE_PATH = os.path.join(BASE_DIR, "solucao.p8r")
+PROFILE_FILE_PATH = os.path.join(BASE_DIR, "perfil_quadros.json")
+
+HEURISTICS = heuristic_names(GAME_SIZE)
+MENU_ROW = 30
+MENU_COLUMN = 300
+# O menu começa abaixo da fileira de botões do topo
+MENU_TOP = 90
+ANYTIME_BUDGET = 1.0
+PLAYBACK_DELAY = 300
+PLAYBACK_DELAYS = [50, 100, 200, 300, 500, 800]
+HUD_RECT = pygame.Rect(0, HEIGHT - 50, WIDTH, 50)
+PROFILE_RECT = pygame.Rect(5, 100, 190, 190)
+PROFILE_REFRESH = 0.25
 
 def draw_text(surface, text, size, x, y, color, center=False, max_width=None):
-    font = pygame.font.Font(None, size)
-    if max_width:
-        words = text.split(' ')
-        lines = []
-        line = ""
-        for word in words:
-            test_line = line + word + " "
-            if font.size(test_line)[0] > max_width:
-                lines.append(line)
-                line = word + " "
-            else:
-                line = test_line
-        lines.append(line)
-
-        for i, l in enumerate(lines):
-            text_surface = font.render(l.strip(), True, color)
-            text_rect = text_surface.get_rect()
-            if center:
-                text_rect.center = (x, y + i * size)
-            else:
-                text_rect.topleft = (x, y + i * size)
-            surface.blit(text_surface, text_rect)
-    else:
-        text_surface = font.render(text, True, color)
+    for i, text_surface in enumerate(render_lines(text, size, color, max_width)):
         text_rect = text_surface.get_rect()
         if center:
-            text_rect.center = (x, y)
+            text_rect.center = (x, y + i * size)
         else:
-            text_rect.topleft = (x, y)
+            text_rect.topleft = (x, y + i * size)
         surface.blit(text_surface, text_rect)
 
 
@@ -87,7 +82,8 @@ class Game:
         pygame.display.set_caption(TITLE)
         self.clock = pygame.time.Clock()
         self.shuffle_time = 0
-        self.previous_choice = ""
+        self.previous_choice = -1
+        self.neighbors = neighbors_for(GAME_SIZE)
         self.start_game = False
         self.start_timer = False
         self.elapsed_time = 0
@@ -98,20 +94,50 @@ class Game:
         self.grid_offset_x = (WIDTH - (GAME_SIZE * TILESIZE)) // 2
         self.grid_offset_y = 100
         self.show_settings = False
-        self.saved_solution = None
+        self.last_solution = None
         self.message = ""
         self.message_time = 0
         self.loaded_image = None
         self.tile_images = None
+        self.image_loader = TileImageLoader()
+        self.solution_cache = SolutionCache(path=CACHE_FILE_PATH)
+        self.solver_thread = None
+        self.solver_cancel = None
+        self.solver_result = None
+        self.solver_stats = None
+        self.playback = None
+        self.playback_delay = PLAYBACK_DELAY
+        self.playback_next_step = 0
+        self.full_redraw = True
+        self.drawn_board = None
+        self.drawn_buttons = {}
+        self.drawn_hud = None
+        self.drawn_overlay = None
+        self.message_rect = None
+        self.dt = 1 / FPS
+        self.profiler = FrameProfiler(1 / FPS)
+        self.show_profile = False
+        self.profile_texts = ()
+        self.profile_refresh = 0
+        self.drawn_profile = None
 
     def run(self):
         self.new()
         self.playing = True
+        measure = self.profiler.measure
         while self.playing:
-            self.clock.tick(FPS)
-            self.events()
-            self.update()
+            # Parado, o laço roda devagar: só precisa atender eventos.
+            # O relógio do jogo anda pelo tempo medido, não pelo FPS alvo.
+            self.dt = self.clock.tick(IDLE_FPS if self.is_idle() else FPS) / 1000
+            self.profiler.start_frame(self.dt)
+            with measure("events"):
+                self.events()
+            with measure("update"):
+                self.update()
             self.draw()
+            self.profiler.end_frame()
+        self.cancel_solver()
+        self.solution_cache.save()
         pygame.quit()
 
     def get_high_scores(self):
@@ -131,101 +157,122 @@ class Game:
         grid[-1][-1] = 0
         return grid
 
-    def shuffle_many(self, steps=100):
-     for _ in range(steps):
-        possible_moves = []
-        for row, tiles in enumerate(self.tiles_grid):
-            for col, tile in enumerate(tiles):
-                if tile == 0:
-                    if col < GAME_SIZE - 1: possible_moves.append("right")
-                    if col > 0: possible_moves.append("left")
-                    if row > 0: possible_moves.append("up")
-                    if row < GAME_SIZE - 1: possible_moves.append("down")
-                    break
-            if possible_moves: break
-
-        if self.previous_choice == "right": possible_moves = [move for move in possible_moves if move != "left"]
-        elif self.previous_choice == "left": possible_moves = [move for move in possible_moves if move != "right"]
-        elif self.previous_choice == "up": possible_moves = [move for move in possible_moves if move != "down"]
-        elif self.previous_choice == "down": possible_moves = [move for move in possible_moves if move != "up"]
-
-        choice = random.choice(possible_moves)
-        self.previous_choice = choice
-        row, col = [(r, c) for r in range(GAME_SIZE) for c in range(GAME_SIZE) if self.tiles_grid[r][c] == 0][0]
-        if choice == "right":
-            self.tiles_grid[row][col], self.tiles_grid[row][col + 1] = self.tiles_grid[row][col + 1], self.tiles_grid[row][col]
-        elif choice == "left":
-            self.tiles_grid[row][col], self.tiles_grid[row][col - 1] = self.tiles_grid[row][col - 1], self.tiles_grid[row][col]
-        elif choice == "up":
-            self.tiles_grid[row][col], self.tiles_grid[row - 1][col] = self.tiles_grid[row - 1][col], self.tiles_grid[row][col]
-        elif choice == "down":
-            self.tiles_grid[row][col], self.tiles_grid[row + 1][col] = self.tiles_grid[row + 1][col], self.tiles_grid[row][col]
+    @property
+    def tiles_grid(self):
+        return [self.board[i:i + GAME_SIZE] for i in range(0, GAME_SIZE * GAME_SIZE, GAME_SIZE)]
 
+    @tiles_grid.setter
+    def tiles_grid(self, grid):
+        self.board = [tile for row in grid for tile in row]
+        self.blank = self.board.index(0)
 
-    def load_and_split_image(self, image_path):
-        image = pygame.image.load(image_path).convert()
-        image = pygame.transform.scale(image, (TILESIZE * GAME_SIZE, TILESIZE * GAME_SIZE))
-        self.tile_images = []
-    
-        for row in range(GAME_SIZE):
-            row_imgs = []
-            for col in range(GAME_SIZE):
-                sub_image = image.subsurface(pygame.Rect(col * TILESIZE, row * TILESIZE, TILESIZE, TILESIZE))
-                row_imgs.append(sub_image)
-            self.tile_images.append(row_imgs)
+    def shuffle_many(self, steps=100):
+        # O vazio fica guardado em self.blank e os vizinhos vêm da mesma
+        # tabela do solver, então cada passo é O(1).
+        board, neighbors = self.board, self.neighbors
+        blank, previous = self.blank, self.previous_choice
+        for _ in range(steps):
+            options = [(neighbor, move) for neighbor, move in neighbors[blank] if move != previous ^ 1]
+            neighbor, previous = random.choice(options)
+            board[blank], board[neighbor] = board[neighbor], 0
+            blank = neighbor
+        self.blank, self.previous_choice = blank, previous
 
+    def load_and_split_image(self, image_path):
+        # A decodificação roda em segundo plano; update() aplica o resultado
+        try:
+            self.image_loader.request(image_path, TILESIZE, GAME_SIZE)
+        except OSError:
+            self.message = "Não foi possível abrir a imagem"
+        else:
+            self.message = "Carregando imagem..."
+        self.message_time = time.time()
+
+    def apply_loaded_image(self):
+        loaded = self.image_loader.poll()
+        if loaded is None:
+            return
+        tiles, error = loaded
+        if error is not None:
+            self.message = "Não foi possível abrir a imagem"
+            self.message_time = time.time()
+            return
+        self.tile_images = tiles
         self.loaded_image = True
+        self.full_redraw = True
+        if self.message == "Carregando imagem...":
+            self.message = ""
+
+    def tile_rect(self, row, col):
+        x = self.grid_offset_x + col * TILESIZE
+        y = self.grid_offset_y + row * TILESIZE
+        return pygame.Rect(x, y, TILESIZE, TILESIZE)
+
+    def draw_tile(self, row, col):
+        value = self.board[row * GAME_SIZE + col]
+        rect = self.tile_rect(row, col)
+
+        if value != 0:
+            pygame.draw.rect(self.screen, (173, 216, 230), rect, border_radius=8)
+            pygame.draw.rect(self.screen, COLOR2, rect, 2, border_radius=8)
+
+            if self.loaded_image:
+                img_row = (value - 1) // GAME_SIZE
+                img_col = (value - 1) % GAME_SIZE
+                image_part = self.tile_images[img_row][img_col]
+                self.screen.blit(image_part, rect)
+            else:
+                draw_text(self.screen, str(value), 36, rect.centerx, rect.centery, BLACK, center=True)
+        else:
+            pygame.draw.rect(self.screen, WHITE, rect)
+        return rect
 
     def draw_tiles(self):
         for row in range(GAME_SIZE):
             for col in range(GAME_SIZE):
-                value = self.tiles_grid[row][col]
-                x = self.grid_offset_x + col * TILESIZE
-                y = self.grid_offset_y + row * TILESIZE
-                rect = pygame.Rect(x, y, TILESIZE, TILESIZE)
-
-                if value != 0:
-                    pygame.draw.rect(self.screen, (173, 216, 230), rect, border_radius=8)
-                    pygame.draw.rect(self.screen, COLOR2, rect, 2, border_radius=8)
-
-                    if self.loaded_image:
-                        img_row = (value - 1) // GAME_SIZE
-                        img_col = (value - 1) % GAME_SIZE
-                        image_part = self.tile_images[img_row][img_col]
-                        self.screen.blit(image_part, rect)
-                    else:
-                        draw_text(self.screen, str(value), 36, rect.centerx, rect.centery, BLACK, center=True)
-                else:
-                    pygame.draw.rect(self.screen, WHITE, rect)
+                self.draw_tile(row, col)
+
+    def settings_menu_rect(self):
+     # Algoritmos à esquerda e, com A*, heurísticas numa segunda coluna
+     columns = 2 if self.selected_algorithm == "A*" else 1
+     rows = max(len(ALGORITHMS), len(HEURISTICS)) if columns == 2 else len(ALGORITHMS)
+     menu_width = columns * MENU_COLUMN
+     menu_height = 120 + rows * MENU_ROW
+     menu_x = (WIDTH - menu_width) // 2
+     menu_y = max(MENU_TOP, (HEIGHT - menu_height) // 2)
+     return pygame.Rect(menu_x, menu_y, menu_width, menu_height)
+
+    def menu_row_rect(self, column, idx):
+     return pygame.Rect(self.settings_rect.left + column * MENU_COLUMN, self.settings_rect.top + 80 + idx * MENU_ROW - MENU_ROW // 2, MENU_COLUMN, MENU_ROW)
 
     def draw_settings_menu(self):
-     menu_width = 400
-     menu_height = 300 + (len(HEURISTICS) * 40 if self.selected_algorithm == "A*" else 0)
-     menu_x = (WIDTH - menu_width) // 2
-     menu_y = (HEIGHT - menu_height) // 2
-     menu_rect = pygame.Rect(menu_x, menu_y, menu_width, menu_height)
+     menu_rect = self.settings_menu_rect()
 
      self.settings_rect = menu_rect 
 
      pygame.draw.rect(self.screen, PINK, menu_rect, border_radius=10)
      pygame.draw.rect(self.screen, COLOR2, menu_rect, 2, border_radius=10)
 
-     draw_text(self.screen, "Algoritmo:", 28, menu_rect.centerx, menu_rect.top + 40, BLACK, center=True)
+     draw_text(self.screen, "Algoritmo:", 28, menu_rect.left + MENU_COLUMN // 2, menu_rect.top + 40, BLACK, center=True)
      for idx, alg in enumerate(ALGORITHMS):
         color = (100, 100, 255) if self.selected_algorithm == alg else BLACK
-        draw_text(self.screen, alg, 24, menu_rect.centerx, menu_rect.top + 80 + idx * 40, color, center=True)
+        row = self.menu_row_rect(0, idx)
+        draw_text(self.screen, alg, 24, row.centerx, row.centery, color, center=True)
 
      if self.selected_algorithm == "A*":
-        draw_text(self.screen, "Heurística:", 28, menu_rect.centerx, menu_rect.top + 80 + len(ALGORITHMS) * 40 + 10, BLACK, center=True)
+        draw_text(self.screen, "Heurística:", 28, menu_rect.left + MENU_COLUMN + MENU_COLUMN // 2, menu_rect.top + 40, BLACK, center=True)
         for idx, heuristic in enumerate(HEURISTICS):
             color = (100, 100, 255) if self.selected_heuristic == heuristic else BLACK
-            draw_text(self.screen, heuristic, 24, menu_rect.centerx, menu_rect.top + 80 + len(ALGORITHMS) * 40 + 50 + idx * 40, color, center=True)
+            row = self.menu_row_rect(1, idx)
+            draw_text(self.screen, heuristic, 24, row.centerx, row.centery, color, center=True)
 
      draw_text(self.screen, "Clique fora da caixa para fechar", 16, menu_rect.centerx, menu_rect.bottom - 30, (100, 100, 100), center=True)
 
     def new(self):
         self.tiles_grid = self.create_game()
         self.tiles_grid_completed = self.create_game()
+        self.board_completed = [tile for row in self.tiles_grid_completed for tile in row]
+        self.full_redraw = True
         self.elapsed_time = 0
         self.moves = 0
         self.start_timer = False
@@ -255,13 +302,27 @@ class Game:
 
     def update(self):
         if self.start_game:
-            if self.tiles_grid == self.tiles_grid_completed:
+            if self.board == self.board_completed:
                 self.start_game = False
                 if self.elapsed_time < self.high_score or self.high_score == 0:
                     self.high_score = self.elapsed_time
                     self.save_score()
             elif self.start_timer:
-                self.elapsed_time += 1 / FPS
+                self.elapsed_time += self.dt
+
+        self.apply_loaded_image()
+
+        if self.solver_result is not None:
+            (cancel, stats, start, moves), self.solver_result = self.solver_result, None
+            if not cancel.is_set():
+                self.solver_stats = stats
+                self.start_playback(start, moves)
+
+        if self.playback is not None:
+            now = pygame.time.get_ticks()
+            while self.playback is not None and now >= self.playback_next_step:
+                self.step_playback()
+                self.playback_next_step += self.playback_delay
 
         if self.message and time.time() - self.message_time > 2:
             self.message = ""
@@ -269,45 +330,240 @@ class Game:
 
 
     def animate_solution(self):
-        path = resolucao(self.tiles_grid, self.selected_algorithm, self.selected_heuristic)
-        if path:
-            self.moves = 0
-            self.elapsed_time = 0
-            self.start_timer = True
-            self.start_game = True
-            start_time = time.time()
-
-            for state in path[1:]:
-                self.tiles_grid = state
-                self.moves += 1
-                self.elapsed_time = time.time() - start_time
-                self.draw()
-                pygame.time.delay(300)
-            self.elapsed_time = time.time() - start_time
+        # O solver roda numa thread e a animação avança em update(), então
+        # a janela continua respondendo durante a busca e a reprodução.
+        if self.is_solving():
+            return
+        self.stop_playback()
+        self.solver_cancel = threading.Event()
+        self.solver_thread = threading.Thread(
+            target=self.solve_worker,
+            args=(self.board[:], self.selected_algorithm, self.selected_heuristic, self.solver_cancel),
+            daemon=True,
+        )
+        self.solver_thread.start()
+
+    def solve_worker(self, board, algoritmo, heuristica, cancel):
+        stats = SearchStats(cancel)
+        time_budget = ANYTIME_BUDGET if algoritmo == "A* Anytime" else None
+        try:
+            moves = solve(board, algoritmo, heuristica, stats, self.solution_cache, time_budget)
+        except BudgetExhausted:
+            message = "Tempo esgotado sem solução"
+        except SearchCancelled:
+            return
+        except ValueError as e:
+            message = str(e)
+        else:
+            # update() descarta o resultado se a busca foi cancelada depois
+            self.solver_result = (cancel, stats, board, moves)
+            return
+        if not cancel.is_set():
+            self.message = message
+            self.message_time = time.time()
+
+    def is_solving(self):
+        return self.solver_thread is not None and self.solver_thread.is_alive()
+
+    def cancel_solver(self):
+        # Não espera a thread: construir uma tabela pela primeira vez não
+        # confere o cancelamento e travaria a janela. A thread termina
+        # sozinha e o resultado dela é ignorado.
+        if self.solver_cancel is not None:
+            self.solver_cancel.set()
+        self.solver_thread = None
+        self.solver_cancel = None
+        self.solver_result = None
+
+    def start_playback(self, start, moves):
+        # A reprodução guarda só o tabuleiro inicial e os movimentos; os
+        # estados são gerados um a um conforme a animação avança.
+        self.last_solution = (start[:], list(moves))
+        if not moves:
+            return
+        self.moves = 0
+        self.elapsed_time = 0
+        self.start_timer = True
+        self.start_game = True
+        self.playback = iter_states(start, moves)
+        next(self.playback)
+        self.playback_next_step = pygame.time.get_ticks() + self.playback_delay
+
+    def step_playback(self):
+        state = next(self.playback, None)
+        if state is None:
+            self.stop_playback()
+            return
+        self.board = state
+        self.blank = state.index(0)
+        self.moves += 1
+
+    def skip_playback(self):
+        while self.playback is not None:
+            self.step_playback()
+
+    def stop_playback(self):
+        if self.playback is not None:
+            self.playback = None
             self.start_timer = False
 
-    def draw(self):
-        self.screen.fill(LIGHTBLUE)
-        self.draw_tiles()
-
-        for button in self.buttons_list:
-            button.draw(self.screen)
-
-        if self.show_settings:
-            self.draw_settings_menu()
+    def change_playback_speed(self, step):
+        idx = PLAYBACK_DELAYS.index(self.playback_delay)
+        idx = max(0, min(len(PLAYBACK_DELAYS) - 1, idx - step))
+        self.playback_delay = PLAYBACK_DELAYS[idx]
+        self.message = f"Velocidade: {self.playback_delay} ms por movimento"
+        self.message_time = time.time()
+
+    def hud_texts(self):
+        info = ""
+        if self.solver_stats:
+            stats = self.solver_stats
+            info = "Solução em cache" if stats.cached else f"Nós: {stats.expanded}  Busca: {stats.wall_time:.2f}s"
+            if stats.bound:
+                info += f"  (até {stats.bound:.1f}x o ótimo)"
+        return (f"Tempo: {self.elapsed_time:.2f}s", f"Movimentos: {self.moves}", info)
+
+    def overlay_message(self):
+        if self.message:
+            return self.message
+        if self.is_solving():
+            return "Resolvendo... (Esc cancela)"
+        return ""
 
+    def draw_hud(self, hud):
         text_spacing = 220
         center_y = HEIGHT - 30
+        tempo, movimentos, info = hud
+
+        draw_text(self.screen, tempo, 24, WIDTH // 2 - text_spacing, center_y, BLACK, center=True)
+        draw_text(self.screen, movimentos, 24, WIDTH // 2 + text_spacing, center_y, BLACK, center=True)
+        if info:
+            draw_text(self.screen, info, 20, WIDTH // 2, center_y, BLACK, center=True)
+        return HUD_RECT
+
+    def profile_lines(self):
+        # Os números mudam a cada quadro; atualiza o texto só algumas vezes
+        # por segundo para continuar legível
+        now = time.time()
+        if now - self.profile_refresh < PROFILE_REFRESH:
+            return self.profile_texts
+        self.profile_refresh = now
+        summary = self.profiler.summary()
+        lines = [f"FPS: {summary['fps']:.1f}",
+                 f"Quadro p50 {summary['frame']['p50']:.1f} p99 {summary['frame']['p99']:.1f} ms",
+                 "Fases (ms): p50 / p99"]
+        for name, phase in summary["phases"].items():
+            lines.append(f"{name}: {phase['p50']:.2f} / {phase['p99']:.2f}")
+        if self.solver_stats:
+            stats = self.solver_stats
+            lines.append(f"Busca: {stats.expanded} nós, {stats.wall_time:.2f}s")
+        self.profile_texts = tuple(lines)
+        return self.profile_texts
+
+    def draw_profile(self, lines):
+        pygame.draw.rect(self.screen, WHITE, PROFILE_RECT, border_radius=6)
+        for i, line in enumerate(lines):
+            draw_text(self.screen, line, 18, PROFILE_RECT.x + 6, PROFILE_RECT.y + 6 + i * 18, BLACK)
+        return PROFILE_RECT
+
+    def dump_profile(self):
+        try:
+            self.profiler.dump(PROFILE_FILE_PATH)
+        except OSError:
+            self.message = "Não foi possível salvar o perfil"
+        else:
+            self.message = f"Perfil salvo em {os.path.basename(PROFILE_FILE_PATH)}"
+        self.message_time = time.time()
 
-        draw_text(self.screen, f"Tempo: {self.elapsed_time:.2f}s", 24, WIDTH // 2 - text_spacing, center_y, BLACK, center=True)
-        draw_text(self.screen, f"Movimentos: {self.moves}", 24, WIDTH // 2 + text_spacing, center_y, BLACK, center=True)
+    def draw_full(self, hud, message, profile):
+        measure = self.profiler.measure
+        self.screen.fill(LIGHTBLUE)
+        with measure("draw_tiles"):
+            self.draw_tiles()
 
-        if self.message:
-            draw_text(self.screen, self.message, 24, WIDTH // 2, HEIGHT // 2, BLACK, center=True)
+        with measure("buttons"):
+            for button in self.buttons_list:
+                button.draw(self.screen)
+
+        if profile:
+            self.draw_profile(profile)
 
-        pygame.display.update()
+        if self.show_settings:
+            with measure("settings_menu"):
+                self.draw_settings_menu()
 
+        self.draw_hud(hud)
 
+        if message:
+            self.message_rect = render_lines(message, 24, BLACK)[0].get_rect(center=(WIDTH // 2, HEIGHT // 2))
+            draw_text(self.screen, message, 24, WIDTH // 2, HEIGHT // 2, BLACK, center=True)
+
+    def draw(self):
+        # Redesenha só o que mudou desde o último quadro; sem mudanças, não
+        # desenha nada nem atualiza a tela.
+        measure = self.profiler.measure
+        hud = self.hud_texts()
+        profile = self.profile_lines() if self.show_profile else ()
+        overlay = (self.show_settings, self.selected_algorithm, self.selected_heuristic, self.overlay_message())
+
+        changed_tiles = []
+        if self.drawn_board is not None:
+            changed_tiles = [i for i, (value, drawn) in enumerate(zip(self.board, self.drawn_board)) if value != drawn]
+        changed_buttons = [button for button in self.buttons_list if button.text != self.drawn_buttons.get(button.name)]
+        dirty = [self.tile_rect(*divmod(i, GAME_SIZE)) for i in changed_tiles] + [button.rect for button in changed_buttons]
+        if hud != self.drawn_hud:
+            dirty.append(HUD_RECT)
+        if profile != self.drawn_profile:
+            dirty.append(PROFILE_RECT)
+
+        full = self.full_redraw or overlay != self.drawn_overlay
+        if not full:
+            # O menu e a mensagem ficam por cima do resto (e não mudaram desde
+            # o último quadro completo): se algo embaixo deles mudou, um
+            # redesenho parcial apagaria parte deles
+            covers = []
+            if self.show_settings:
+                covers.append(self.settings_rect)
+            if overlay[-1]:
+                covers.append(self.message_rect)
+            full = any(rect.collidelist(covers) != -1 for rect in dirty)
+
+        if full:
+            self.draw_full(hud, overlay[-1], profile)
+            with measure("flip"):
+                pygame.display.update()
+        else:
+            rects = []
+            if changed_tiles:
+                with measure("draw_tiles"):
+                    for i in changed_tiles:
+                        row, col = divmod(i, GAME_SIZE)
+                        self.screen.fill(LIGHTBLUE, self.tile_rect(row, col))
+                        rects.append(self.draw_tile(row, col))
+            with measure("buttons"):
+                for button in changed_buttons:
+                    self.screen.fill(LIGHTBLUE, button.rect)
+                    button.draw(self.screen)
+                    rects.append(button.rect)
+            if hud != self.drawn_hud:
+                self.screen.fill(LIGHTBLUE, HUD_RECT)
+                rects.append(self.draw_hud(hud))
+            if profile != self.drawn_profile:
+                self.screen.fill(LIGHTBLUE, PROFILE_RECT)
+                rects.append(self.draw_profile(profile))
+            if rects:
+                with measure("flip"):
+                    pygame.display.update(rects)
+
+        self.full_redraw = False
+        self.drawn_board = self.board[:]
+        self.drawn_buttons = {button.name: button.text for button in self.buttons_list}
+        self.drawn_hud = hud
+        self.drawn_overlay = overlay
+        self.drawn_profile = profile
+
+    def is_idle(self):
+        return not (self.start_timer or self.playback or self.is_solving() or self.message or self.full_redraw)
 
     def upload_image(self):
         root = tk.Tk()
@@ -321,6 +577,25 @@ class Game:
         if event.type == pygame.QUIT:
             self.playing = False
 
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.full_redraw = True
+
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.cancel_solver()
+                self.stop_playback()
+            elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                self.skip_playback()
+            elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                self.change_playback_speed(1)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self.change_playback_speed(-1)
+            elif event.key == pygame.K_F3:
+                self.show_profile = not self.show_profile
+                self.full_redraw = True
+            elif event.key == pygame.K_F4:
+                self.dump_profile()
+
         elif event.type == pygame.MOUSEBUTTONDOWN:
             mx, my = pygame.mouse.get_pos()
 
@@ -333,15 +608,14 @@ class Game:
                     self.show_settings = not self.show_settings
                     return  
                 
-                if button.name == "imagem" and button.click(mx, my):
+                # O botão de imagem fica embaixo do menu aberto
+                if button.name == "imagem" and not self.show_settings and button.click(mx, my):
                     self.upload_image()  # Abre a janela de upload de imagem
                     return 
 
             if self.show_settings:
                 for idx, alg in enumerate(ALGORITHMS):
-                    alg_rect_top = self.settings_rect.top + 80 + idx * 40
-                    alg_rect_bottom = alg_rect_top + 24  
-                    if alg_rect_top <= my <= alg_rect_bottom and self.settings_rect.left <= mx <= self.settings_rect.right:
+                    if self.menu_row_rect(0, idx).collidepoint(mx, my):
                         self.selected_algorithm = alg
                         if alg != "A*":
                             self.selected_heuristic = None  # Reseta a heurística se não for A*
@@ -351,15 +625,21 @@ class Game:
                 # Verifica cliques na heurística, se estiver visível
                 if self.selected_algorithm == "A*":
                     for idx, heuristic in enumerate(HEURISTICS):
-                        heuristic_rect_top = self.settings_rect.top + 80 + len(ALGORITHMS) * 40 + 50 + idx * 40
-                        heuristic_rect_bottom = heuristic_rect_top + 24
-                        if heuristic_rect_top <= my <= heuristic_rect_bottom and self.settings_rect.left <= mx <= self.settings_rect.right:
+                        if self.menu_row_rect(1, idx).collidepoint(mx, my):
                             self.selected_heuristic = heuristic
                             self.atualizar_texto_botao_algoritmo()
                             return
 
+                # Cliques no menu que não acertam uma linha não chegam aos botões embaixo
+                if self.settings_rect.collidepoint(mx, my):
+                    return
+
             for button in self.buttons_list:
                 if button.click(mx, my):
+                    if button.text in ("Embaralhar", "Reiniciar", "Carregar Solução"):
+                        self.cancel_solver()
+                        self.stop_playback()
+
                     if button.text == "Embaralhar":
                         self.shuffle_many(30)
                         self.moves = 0
@@ -368,25 +648,36 @@ class Game:
                         self.start_timer = False
 
                     elif button.text == "Reiniciar":
+                        self.solver_stats = None
                         self.new()
 
                     elif button.text == "Resolver":
                         self.animate_solution()
 
                     elif button.text == "Salvar Solução":
-                        self.saved_solution = self.tiles_grid
+                        start, moves = self.last_solution or (self.board[:], [])
+                        save_replay(SOLUTION_FILE_PATH, start, moves, [self.playback_delay] * len(moves))
                         self.message = "Solução salva!"
                         self.message_time = time.time()
 
                     elif button.text == "Carregar Solução":
-                        if self.saved_solution:
-                            self.tiles_grid = self.saved_solution
+                        try:
+                            replay = load_replay(SOLUTION_FILE_PATH)
+                            if len(replay.start) != GAME_SIZE * GAME_SIZE:
+                                raise ReplayError("tamanho de tabuleiro diferente")
+                        except (OSError, ReplayError):
+                            self.message = "Nenhuma solução salva"
+                        else:
+                            self.stop_playback()
+                            self.board = list(replay.start)
+                            self.blank = self.board.index(0)
                             self.start_game = False
                             self.moves = 0
                             self.elapsed_time = 0
                             self.start_timer = False
+                            self.start_playback(self.board[:], replay.moves)
                             self.message = "Solução carregada!"
-                            self.message_time = time.time()
+                        self.message_time = time.time()
     def atualizar_texto_botao_algoritmo(self):
      for button in self.buttons_list:
         if button.name == "algoritmo":
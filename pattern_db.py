@@ -0,0 +1,98 @@
+from collections import deque
+import bulk_bfs
+import table_file
+from solver import goal_for, neighbor_table
+
+# Partições disjuntas das peças: cada padrão conta só os movimentos das
+# suas próprias peças, então as tabelas podem ser somadas sem superestimar.
+PARTITIONS = {
+    2: [(1, 2, 3)],
+    3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+    4: [(1, 2, 3, 5, 6), (4, 7, 8, 11, 12), (9, 10, 13, 14, 15)],
+}
+UNKNOWN = 255
+
+_databases = {}
+
+def build_pattern(pattern, n):
+    # BFS 0-1 sobre (posições das peças do padrão, posição do vazio):
+    # mover uma peça do padrão custa 1, mover qualquer outra custa 0.
+    if bulk_bfs.available():
+        return bulk_bfs.pattern_table(pattern, n)
+    k = len(pattern)
+    blank_shift = 4 * k
+    goal = goal_for(n)
+    moves = neighbor_table(n)
+    start = 0
+    for slot, tile in enumerate(pattern):
+        start |= goal.index(tile) << (4 * slot)
+    start |= goal.index(0) << blank_shift
+
+    dist = bytearray([UNKNOWN]) * (1 << (blank_shift + 4))
+    dist[start] = 0
+    frontier = deque([(start, 0)])
+    while frontier:
+        state, d = frontier.popleft()
+        if d > dist[state]:
+            continue
+        blank = state >> blank_shift
+        occupied = {(state >> (4 * slot)) & 15: slot for slot in range(k)}
+        base = state & ((1 << blank_shift) - 1)
+        for neighbor in moves[blank]:
+            slot = occupied.get(neighbor)
+            if slot is None:
+                child = base | (neighbor << blank_shift)
+                if d < dist[child]:
+                    dist[child] = d
+                    frontier.appendleft((child, d))
+            else:
+                child = (base + ((blank - neighbor) << (4 * slot))) | (neighbor << blank_shift)
+                if d + 1 < dist[child]:
+                    dist[child] = d + 1
+                    frontier.append((child, d + 1))
+
+    table = bytearray([UNKNOWN]) * (1 << blank_shift)
+    for state, d in enumerate(dist):
+        if d != UNKNOWN:
+            index = state & ((1 << blank_shift) - 1)
+            if d < table[index]:
+                table[index] = d
+    return table
+
+def table_name(pattern, n):
+    return f"pdb_{n}x{n}_" + "-".join(str(tile) for tile in pattern)
+
+class PatternDatabase:
+    def __init__(self, n, partition=None):
+        self.n = n
+        self.partition = partition or PARTITIONS[n]
+        self.tables = [
+            table_file.load(table_name(pattern, n), n, lambda pattern=pattern: build_pattern(pattern, n))
+            for pattern in self.partition
+        ]
+        # slots[peça] = (índice do padrão, deslocamento da peça no índice)
+        self.slots = [None] * (n * n)
+        for p, pattern in enumerate(self.partition):
+            for slot, tile in enumerate(pattern):
+                self.slots[tile] = (p, 4 * slot)
+
+    def indices(self, board):
+        indices = [0] * len(self.partition)
+        for position, tile in enumerate(board):
+            if tile:
+                p, shift = self.slots[tile]
+                indices[p] |= position << shift
+        return indices
+
+    def value(self, indices):
+        return sum(table[index] for table, index in zip(self.tables, indices))
+
+    def __call__(self, board):
+        return self.value(self.indices(board))
+
+def for_size(n):
+    if n not in PARTITIONS:
+        raise ValueError(f"Não há base de padrões para o {n}x{n}")
+    if n not in _databases:
+        _databases[n] = PatternDatabase(n)
+    return _databases[n]
@@ -0,0 +1,106 @@
+import json
+import time
+from collections import deque
+
+# Janela de quadros usada nos percentis e nos histogramas
+WINDOW = 600
+MAX_SLOW_FRAMES = 100
+# Limites superiores (ms) das faixas do histograma
+BUCKETS = [0.5, 1, 2, 4, 8, 16, 33, 66, 133, 266, 533, float("inf")]
+
+class Phase:
+    # Cronômetro reutilizável: with profiler.measure("update"): ...
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        current = self.profiler.current
+        current[self.name] = current.get(self.name, 0.0) + time.perf_counter() - self.started
+
+class FrameProfiler:
+    def __init__(self, budget, window=WINDOW):
+        self.budget = budget
+        self.window = window
+        self.phases = {}
+        self.samples = {}
+        self.intervals = deque(maxlen=window)
+        self.work = deque(maxlen=window)
+        self.slow_frames = deque(maxlen=MAX_SLOW_FRAMES)
+        self.current = {}
+        self.frames = 0
+        self.created = time.perf_counter()
+        self.frame_started = None
+
+    def measure(self, name):
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = Phase(self, name)
+            self.samples[name] = deque(maxlen=self.window)
+        return phase
+
+    def start_frame(self, interval):
+        # interval: tempo real desde o quadro anterior (inclui a espera do tick)
+        self.frame_started = time.perf_counter()
+        self.intervals.append(interval)
+        self.current = {}
+
+    def end_frame(self):
+        work = time.perf_counter() - self.frame_started
+        self.work.append(work)
+        self.frames += 1
+        for name, samples in self.samples.items():
+            samples.append(self.current.get(name, 0.0))
+        # Quadros que estouram o orçamento ficam guardados com o detalhamento
+        if work > self.budget:
+            self.slow_frames.append({
+                "time": round(self.frame_started - self.created, 3),
+                "work_ms": round(work * 1000, 3),
+                "phases_ms": {name: round(value * 1000, 3) for name, value in self.current.items()},
+            })
+
+    def fps(self):
+        total = sum(self.intervals)
+        return len(self.intervals) / total if total else 0.0
+
+    def summary(self):
+        phases = {name: stats_ms(samples) for name, samples in self.samples.items()}
+        return {"fps": round(self.fps(), 1), "frame": stats_ms(self.work), "interval": stats_ms(self.intervals), "phases": phases}
+
+    def dump(self, path):
+        data = {
+            "frames": self.frames,
+            "budget_ms": round(self.budget * 1000, 3),
+            "summary": self.summary(),
+            "histograms": {name: histogram(samples) for name, samples in self.samples.items()},
+            "frame_histogram": histogram(self.work),
+            "slow_frames": list(self.slow_frames),
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def stats_ms(samples):
+    return {
+        "p50": round(percentile(samples, 0.50) * 1000, 3),
+        "p99": round(percentile(samples, 0.99) * 1000, 3),
+        "max": round(max(samples, default=0.0) * 1000, 3),
+    }
+
+def histogram(samples):
+    counts = [0] * len(BUCKETS)
+    for value in samples:
+        ms = value * 1000
+        for i, limit in enumerate(BUCKETS):
+            if ms <= limit:
+                counts[i] += 1
+                break
+    return {f"<={limit}ms" if limit != float("inf") else "mais": count for limit, count in zip(BUCKETS, counts)}
\ No newline at end of file
@@ -0,0 +1,77 @@
+import struct
+from solver import board_size, iter_states, pack, unpack
+
+# magic, versão, tamanho do tabuleiro, flags, estado inicial empacotado, nº de movimentos
+HEADER = struct.Struct("<4sBBHQI")
+MAGIC = b"P8RP"
+VERSION = 1
+HAS_TIMINGS = 1
+
+class ReplayError(ValueError):
+    pass
+
+class Replay:
+    def __init__(self, start, moves, timings=None):
+        self.start = start
+        self.moves = moves
+        self.timings = timings
+
+    def states(self):
+        return iter_states(self.start, self.moves)
+
+def encode_moves(moves):
+    # 2 bits por movimento, 4 movimentos por byte
+    data = bytearray((len(moves) + 3) // 4)
+    for i, move in enumerate(moves):
+        data[i >> 2] |= move << ((i & 3) * 2)
+    return bytes(data)
+
+def decode_moves(data, count):
+    return [(data[i >> 2] >> ((i & 3) * 2)) & 3 for i in range(count)]
+
+def write_replay(f, start, moves, timings=None):
+    flags = HAS_TIMINGS if timings is not None else 0
+    f.write(HEADER.pack(MAGIC, VERSION, board_size(start), flags, pack(start), len(moves)))
+    f.write(encode_moves(moves))
+    if timings is not None:
+        # Milissegundos por movimento, limitados a 16 bits
+        f.write(struct.pack(f"<{len(moves)}H", *(min(int(ms), 0xFFFF) for ms in timings)))
+
+def read_replay(f):
+    # Devolve o próximo Replay do arquivo, ou None no fim
+    header = f.read(HEADER.size)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        raise ReplayError("replay truncado")
+    magic, version, n, flags, code, count = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ReplayError("formato de replay desconhecido")
+    data = f.read((count + 3) // 4)
+    if len(data) < (count + 3) // 4:
+        raise ReplayError("replay truncado")
+    timings = None
+    if flags & HAS_TIMINGS:
+        raw = f.read(2 * count)
+        if len(raw) < 2 * count:
+            raise ReplayError("replay truncado")
+        timings = list(struct.unpack(f"<{count}H", raw))
+    return Replay(unpack(code, n), decode_moves(data, count), timings)
+
+def iter_replays(f):
+    while True:
+        replay = read_replay(f)
+        if replay is None:
+            return
+        yield replay
+
+def save_replay(path, start, moves, timings=None):
+    with open(path, "wb") as f:
+        write_replay(f, start, moves, timings)
+
+def load_replay(path):
+    with open(path, "rb") as f:
+        replay = read_replay(f)
+    if replay is None:
+        raise ReplayError("arquivo de replay vazio")
+    return replay
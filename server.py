@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Pool
+from cli import MOVE_LETTERS, parse_board
+from client import HOST, PORT
+from solution_cache import MISS, SolutionCache
+from solver import BudgetExhausted, SearchStats, is_solvable, solve, validate_board
+
+def warm_tables():
+    # Abre as tabelas (gerando os arquivos se ainda não existirem). Os arquivos
+    # são mapeados em memória, então todos os processos dividem as mesmas páginas.
+    import pattern_db
+    from distance_table import load_table
+    load_table()
+    pattern_db.for_size(3)
+
+def _solve(job):
+    board, algoritmo, heuristica, time_budget, node_budget = job
+    stats = SearchStats()
+    try:
+        moves = solve(board, algoritmo, heuristica, stats, None, time_budget, node_budget)
+    except BudgetExhausted:
+        return {"error": "orçamento esgotado", "nodes": stats.expanded}
+    except ValueError as e:
+        return {"error": str(e)}
+    return {"moves": moves, "nodes": stats.expanded, "bound": stats.bound}
+
+class SolverService:
+    # Pool de processos persistente + cache de soluções compartilhado.
+    # Pedidos idênticos que chegam enquanto o primeiro ainda está sendo
+    # resolvido esperam pelo mesmo resultado em vez de ocupar outro processo.
+    def __init__(self, processes=None, cache_path=None):
+        self.processes = processes or os.cpu_count()
+        # Gera as tabelas uma vez aqui; assim os processos só mapeiam os
+        # arquivos prontos em vez de todos gerarem ao mesmo tempo
+        warm_tables()
+        self.pool = Pool(self.processes, initializer=warm_tables)
+        self.cache = SolutionCache(path=cache_path)
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.started = time.time()
+        self.requests = 0
+        self.coalesced = 0
+        self.solved = 0
+        self.errors = 0
+        self.solve_time = 0.0
+
+    def solve(self, board, algoritmo="A*", heuristica="Manhattan", time_budget=None, node_budget=None):
+        start_time = time.perf_counter()
+        with self.lock:
+            self.requests += 1
+        try:
+            validate_board(board)
+        except ValueError as e:
+            return self.failed({"error": f"tabuleiro inválido: {e}"})
+        if not is_solvable(board):
+            return self.failed({"board": board, "solved": False, "error": "sem solução"})
+        budgeted = time_budget is not None or node_budget is not None
+        key = (tuple(board), algoritmo, heuristica, time_budget, node_budget)
+        with self.lock:
+            moves = MISS if budgeted else self.cache.get(board, algoritmo, heuristica)
+            future = owner = None
+            if moves is MISS:
+                future = self.in_flight.get(key)
+                owner = future is None
+                if owner:
+                    future = self.in_flight[key] = Future()
+                else:
+                    self.coalesced += 1
+        if moves is not MISS:
+            return self.answer(board, {"moves": moves, "nodes": 0, "cached": True}, start_time)
+        if owner:
+            self.pool.apply_async(
+                _solve, ((board, algoritmo, heuristica, time_budget, node_budget),),
+                callback=lambda result: self.finish(key, future, result, not budgeted),
+                error_callback=lambda error: self.finish(key, future, {"error": str(error)}, False),
+            )
+        result = future.result()
+        if "error" in result:
+            return self.failed(dict(result, board=board, solved=False))
+        return self.answer(board, result, start_time)
+
+    def finish(self, key, future, result, cacheable):
+        # Roda na thread de resultados do Pool
+        with self.lock:
+            del self.in_flight[key]
+            if cacheable and "error" not in result:
+                board, algoritmo, heuristica = key[:3]
+                self.cache.put(list(board), algoritmo, heuristica, result["moves"])
+        future.set_result(result)
+
+    def answer(self, board, result, start_time):
+        elapsed = time.perf_counter() - start_time
+        with self.lock:
+            self.solved += 1
+            self.solve_time += elapsed
+        moves = result["moves"]
+        answer = {
+            "board": board,
+            "solved": moves is not None,
+            "nodes": result["nodes"],
+            "time": round(elapsed, 6),
+            "cached": result.get("cached", False),
+        }
+        if moves is not None:
+            answer["moves"] = "".join(MOVE_LETTERS[move] for move in moves)
+            answer["length"] = len(moves)
+        if result.get("bound") is not None:
+            answer["bound"] = result["bound"]
+        return answer
+
+    def failed(self, answer):
+        with self.lock:
+            self.errors += 1
+        return answer
+
+    def health(self):
+        return {"status": "ok", "processes": self.processes, "uptime": round(time.time() - self.started, 3)}
+
+    def metrics(self):
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "solved": self.solved,
+                "errors": self.errors,
+                "coalesced": self.coalesced,
+                "in_flight": len(self.in_flight),
+                "cache_hits": self.cache.hits,
+                "cache_misses": self.cache.misses,
+                "cache_entries": len(self.cache.entries),
+                "mean_time": round(self.solve_time / self.solved, 6) if self.solved else 0.0,
+            }
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+        if self.cache.path:
+            self.cache.save()
+
+class Handler(BaseHTTPRequestHandler):
+    def send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/saude":
+            self.send_json(200, service.health())
+        elif self.path == "/metricas":
+            self.send_json(200, service.metrics())
+        else:
+            self.send_json(404, {"error": "caminho desconhecido"})
+
+    def do_POST(self):
+        if self.path != "/resolver":
+            self.send_json(404, {"error": "caminho desconhecido"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            board = parse_board(payload)
+        except (KeyError, TypeError, ValueError) as e:
+            self.send_json(400, {"error": f"pedido inválido: {e}"})
+            return
+        # Um array puro é só o tabuleiro, com as opções padrão
+        options = payload if isinstance(payload, dict) else {}
+        result = self.server.service.solve(
+            board,
+            options.get("algoritmo", "A*"),
+            options.get("heuristica", "Manhattan"),
+            options.get("tempo_limite"),
+            options.get("limite_nos"),
+        )
+        self.send_json(200, result)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local de soluções do 8-Puzzle.")
+    parser.add_argument("--porta", type=int, default=PORT)
+    parser.add_argument("--processos", type=int, help="processos de busca (padrão: um por CPU)")
+    parser.add_argument("--cache", help="arquivo para guardar soluções entre execuções")
+    parser.add_argument("--verboso", action="store_true", help="registra cada pedido")
+    args = parser.parse_args(argv)
+
+    service = SolverService(args.processos, args.cache)
+    server = ThreadingHTTPServer((HOST, args.porta), Handler)
+    server.service = service
+    server.verbose = args.verboso
+    print(f"Servindo em http://{HOST}:{args.porta}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
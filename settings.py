@@ -2,6 +2,7 @@ WIDTH = 800
 HEIGHT = 600
 TILESIZE = 100
 FPS = 60
+IDLE_FPS = 10
 TITLE = "8-Puzzle"
 
 WHITE = (255, 255, 255)
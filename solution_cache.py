@@ -0,0 +1,95 @@
+import json
+import os
+from collections import OrderedDict
+from solver import board_size, pack
+
+# Algoritmos cujo resultado não depende da orientação do tabuleiro, então a
+# solução do transposto serve (com os movimentos transpostos).
+SYMMETRIC_ALGORITHMS = {"A*", "Largura", "Largura Bidirecional", "Tabela", "IDA*"}
+HEURISTIC_ALGORITHMS = {"A*", "Busca Gulosa"}
+MISS = object()
+
+def transpose(state):
+    # Espelha pela diagonal principal e renomeia as peças para que o
+    # objetivo continue sendo o objetivo.
+    n = board_size(state)
+    transposed = [0] * (n * n)
+    for i, tile in enumerate(state):
+        row, col = divmod(i, n)
+        if tile:
+            goal_row, goal_col = divmod(tile - 1, n)
+            tile = goal_col * n + goal_row + 1
+        transposed[col * n + row] = tile
+    return transposed
+
+def transpose_moves(moves):
+    # up <-> left, down <-> right
+    return [move ^ 2 for move in moves]
+
+class SolutionCache:
+    def __init__(self, max_entries=10000, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def key(self, state, algoritmo, heuristica):
+        if algoritmo not in HEURISTIC_ALGORITHMS:
+            heuristica = None
+        code = pack(state)
+        if algoritmo in SYMMETRIC_ALGORITHMS:
+            transposed = pack(transpose(state))
+            if transposed < code:
+                return (transposed, algoritmo, heuristica), True
+        return (code, algoritmo, heuristica), False
+
+    def get(self, state, algoritmo, heuristica):
+        key, flipped = self.key(state, algoritmo, heuristica)
+        moves = self.entries.get(key, MISS)
+        if moves is MISS:
+            self.misses += 1
+            return MISS
+        self.hits += 1
+        self.entries.move_to_end(key)
+        if moves is not None and flipped:
+            moves = transpose_moves(moves)
+        return moves
+
+    def put(self, state, algoritmo, heuristica, moves):
+        key, flipped = self.key(state, algoritmo, heuristica)
+        if moves is not None:
+            moves = transpose_moves(moves) if flipped else list(moves)
+        self.entries[key] = moves
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def load(self, path):
+        # Arquivo truncado ou de outro formato: começa com o cache vazio
+        # em vez de impedir o jogo (ou a linha de comando) de abrir
+        entries = OrderedDict()
+        try:
+            with open(path, "r") as f:
+                for code, algoritmo, heuristica, moves in json.load(f):
+                    entries[(code, algoritmo, heuristica)] = moves
+        except (OSError, TypeError, ValueError):
+            return
+        self.entries.update(entries)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self, path=None):
+        path = path or self.path
+        if not path:
+            return
+        data = [[code, algoritmo, heuristica, moves] for (code, algoritmo, heuristica), moves in self.entries.items()]
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
@@ -1,59 +1,693 @@
 from collections import deque
 import heapq
 import math
+import time
+import tracemalloc
 
-GOAL = [1, 2, 3, 4, 5, 6, 7, 8, 0]
-
-MOVES = {
-    0: [1, 3],
-    1: [0, 2, 4],
-    2: [1, 5],
-    3: [0, 4, 6],
-    4: [1, 3, 5, 7],
-    5: [2, 4, 8],
-    6: [3, 7],
-    7: [4, 6, 8],
-    8: [5, 7]
-}
-
-def index_to_move(i1, i2):
+def goal_state(n):
+    return list(range(1, n * n)) + [0]
+
+def neighbor_table(n):
+    moves = {}
+    for i in range(n * n):
+        row, col = divmod(i, n)
+        moves[i] = []
+        if row > 0: moves[i].append(i - n)
+        if col > 0: moves[i].append(i - 1)
+        if col < n - 1: moves[i].append(i + 1)
+        if row < n - 1: moves[i].append(i + n)
+    return moves
+
+def board_size(state):
+    return math.isqrt(len(state))
+
+# Cada estado é um inteiro com 4 bits por casa, casa i nos bits 4*i
+# (36 bits no 3x3, 64 bits no 4x4).
+SHIFTS = [4 * i for i in range(16)]
+MOVE_NAMES = ["up", "down", "left", "right"]
+ALGORITHMS = ["A*", "Busca Gulosa", "Largura", "Largura Bidirecional", "Tabela", "IDA*", "A* Anytime"]
+
+def move_deltas(n):
+    return [-n, n, -1, 1]
+
+def pack(state):
+    code = 0
+    for shift, tile in zip(SHIFTS, state):
+        code |= tile << shift
+    return code
+
+def unpack(code, n=3):
+    return [(code >> shift) & 15 for shift in SHIFTS[:n * n]]
+
+GOALS = {}
+GOAL_CODES = {}
+NEIGHBOR_TABLES = {}
+
+def goal_for(n):
+    if n not in GOALS:
+        GOALS[n] = goal_state(n)
+    return GOALS[n]
+
+def goal_code_for(n):
+    if n not in GOAL_CODES:
+        GOAL_CODES[n] = pack(goal_for(n))
+    return GOAL_CODES[n]
+
+def neighbors_for(n):
+    # Para cada posição do vazio: (casa vizinha, byte do movimento)
+    if n not in NEIGHBOR_TABLES:
+        deltas = move_deltas(n)
+        NEIGHBOR_TABLES[n] = {
+            zero: [(neighbor, deltas.index(neighbor - zero)) for neighbor in neighbors]
+            for zero, neighbors in neighbor_table(n).items()
+        }
+    return NEIGHBOR_TABLES[n]
+
+GOAL = goal_for(3)
+MOVES = neighbor_table(3)
+MOVE_DELTAS = move_deltas(3)
+GOAL_CODE = goal_code_for(3)
+NEIGHBORS = neighbors_for(3)
+
+CHECK_INTERVAL = 1024
+
+class SearchCancelled(Exception):
+    pass
+
+class BudgetExhausted(SearchCancelled):
+    pass
+
+class UnsolvableBoard(ValueError):
+    pass
+
+def count_inversions(values):
+    # Merge sort contando inversões: O(n log n)
+    if len(values) <= 1:
+        return values, 0
+    middle = len(values) // 2
+    left, left_count = count_inversions(values[:middle])
+    right, right_count = count_inversions(values[middle:])
+    merged = []
+    inversions = left_count + right_count
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            merged.append(left[i])
+            i += 1
+        else:
+            merged.append(right[j])
+            inversions += len(left) - i
+            j += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return merged, inversions
+
+def validate_board(state):
+    n = board_size(state)
+    if n < 2 or n * n != len(state):
+        raise ValueError(f"tabuleiro com {len(state)} casas não é quadrado")
+    if n > 4:
+        raise ValueError("o solver suporta tabuleiros de até 4x4")
+    if sorted(state) != list(range(n * n)):
+        raise ValueError(f"o tabuleiro deve conter cada número de 0 a {n * n - 1} uma vez")
+
+def is_solvable(state):
+    n = board_size(state)
+    _, inversions = count_inversions([tile for tile in state if tile])
+    if n % 2:
+        return inversions % 2 == 0
+    # Largura par: conta também a linha do vazio, a partir de baixo
+    blank_row_from_bottom = n - state.index(0) // n
+    return (inversions + blank_row_from_bottom) % 2 == 1
+
+def geometric_sum_below(b, depth, total):
+    # 1 + b + ... + b^depth < total, parando assim que a soma passa do total
+    # para não estourar o float em buscas profundas
+    partial, term = 0.0, 1.0
+    for _ in range(depth + 1):
+        partial += term
+        if partial >= total:
+            return False
+        term *= b
+    return True
+
+class SearchStats:
+    def __init__(self, cancel=None, callback=None, every=CHECK_INTERVAL, timing=False, memory=False):
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.peak_frontier = 0
+        self.peak_memory = None
+        self.heuristic_time = 0.0
+        self.wall_time = 0.0
+        self.depth = None
+        self.cached = False
+        self.bound = None
+        self.deadline = None
+        self.node_budget = None
+        self.cancel = cancel
+        self.callback = callback
+        self.every = every
+        self.next_check = every
+        self.timing = timing
+        self.memory = memory
+
+    @property
+    def expansion_time(self):
+        return self.wall_time - self.heuristic_time
+
+    @property
+    def branching_factor(self):
+        # b* tal que 1 + b* + b*^2 + ... + b*^d = nós gerados + 1
+        if not self.depth or not self.generated:
+            return None
+        total = self.generated + 1
+        # b*^d <= total, então b* não passa de total^(1/d)
+        low, high = 1.0, total ** (1 / self.depth) + 1
+        for _ in range(60):
+            b = (low + high) / 2
+            if geometric_sum_below(b, self.depth, total):
+                low = b
+            else:
+                high = b
+        return (low + high) / 2
+
+    def timed(self, h_func):
+        def timed_h(code):
+            started = time.perf_counter()
+            h = h_func(code)
+            self.heuristic_time += time.perf_counter() - started
+            return h
+        return timed_h
+
+    def check(self):
+        # Chamado a cada `every` expansões, ou antes ao atingir o orçamento de nós
+        if self.cancel is not None and self.cancel.is_set():
+            raise SearchCancelled()
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise BudgetExhausted()
+        if self.node_budget is not None and self.expanded >= self.node_budget:
+            raise BudgetExhausted()
+        if self.callback is not None:
+            self.callback(self)
+        self.next_check = self.expanded + self.every
+        if self.node_budget is not None:
+            self.next_check = min(self.next_check, self.node_budget)
+
+    def as_dict(self):
+        return {
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "duplicates": self.duplicates,
+            "peak_frontier": self.peak_frontier,
+            "peak_memory": self.peak_memory,
+            "branching_factor": self.branching_factor,
+            "heuristic_time": self.heuristic_time,
+            "expansion_time": self.expansion_time,
+            "wall_time": self.wall_time,
+            "depth": self.depth,
+            "cached": self.cached,
+            "bound": self.bound,
+        }
+
+def move_blank(code, zero, neighbor):
+    # O vazio vale 0, então basta mover os 4 bits da peça vizinha
+    tile = (code >> SHIFTS[neighbor]) & 15
+    return code ^ (tile << SHIFTS[neighbor]) ^ (tile << SHIFTS[zero])
+
+def unwind(came_from, code, zero, n=3):
+    deltas = move_deltas(n)
+    moves = []
+    move = came_from[code]
+    while move >= 0:
+        moves.append(move)
+        parent_zero = zero - deltas[move]
+        code = move_blank(code, zero, parent_zero)
+        zero = parent_zero
+        move = came_from[code]
+    moves.reverse()
+    return moves
+
+def manhattan_cost(position, goal_position, n):
+    return abs(position // n - goal_position // n) + abs(position % n - goal_position % n)
+
+def euclidean_cost(position, goal_position, n):
+    dx = (position % n) - (goal_position % n)
+    dy = (position // n) - (goal_position // n)
+    return math.sqrt(dx*dx + dy*dy)
+
+TILE_COST_TABLES = {}
+
+def tile_cost_table(cost, n):
+    # costs[peça][posição]: contribuição da peça naquela casa. Heurísticas
+    # que são soma por peça podem ser atualizadas só com a peça que moveu.
+    key = (cost, n)
+    if key not in TILE_COST_TABLES:
+        goal = goal_for(n)
+        costs = [[0] * (n * n) for _ in range(n * n)]
+        for tile in range(1, n * n):
+            for position in range(n * n):
+                costs[tile][position] = cost(position, goal.index(tile), n)
+        TILE_COST_TABLES[key] = costs
+    return TILE_COST_TABLES[key]
+
+def tile_heuristic(costs, n=3):
+    shifts = list(enumerate(SHIFTS[:n * n]))
+    return lambda code: sum(costs[(code >> shift) & 15][position] for position, shift in shifts)
+
+def conflicts_in_line(goal_lines):
+    # Peças de uma mesma linha que precisam sair dela para as outras ficarem
+    # em ordem: tamanho da linha menos a maior subsequência crescente.
+    longest = []
+    for i, value in enumerate(goal_lines):
+        longest.append(1 + max([longest[j] for j in range(i) if goal_lines[j] < value], default=0))
+    return len(goal_lines) - max(longest, default=0)
+
+LINEAR_CONFLICT_TABLES = {}
+
+def linear_conflict_tables(n):
+    # rows[r][chave] e cols[c][chave], onde a chave são os 4 bits de cada
+    # casa da linha (ou coluna) na ordem em que aparecem no tabuleiro.
+    if n not in LINEAR_CONFLICT_TABLES:
+        rows = [[0] * (16 ** n) for _ in range(n)]
+        cols = [[0] * (16 ** n) for _ in range(n)]
+        for key in range(16 ** n):
+            tiles = [(key >> (4 * j)) & 15 for j in range(n)]
+            tiles = [tile for tile in tiles if 0 < tile < n * n]
+            for line in range(n):
+                rows[line][key] = conflicts_in_line([(tile - 1) % n for tile in tiles if (tile - 1) // n == line])
+                cols[line][key] = conflicts_in_line([(tile - 1) // n for tile in tiles if (tile - 1) % n == line])
+        LINEAR_CONFLICT_TABLES[n] = (rows, cols)
+    return LINEAR_CONFLICT_TABLES[n]
+
+WALKING_DISTANCE_TABLES = {}
+
+def walking_distance_table(n):
+    # Estado = quantas peças de cada linha-objetivo há em cada linha, mais a
+    # linha do vazio. Um movimento leva uma peça da linha vizinha para a do vazio.
+    if n not in WALKING_DISTANCE_TABLES:
+        counts = [0] * (n * n)
+        for row in range(n):
+            counts[row * n + row] = n
+        counts[-1] = n - 1
+        start = (tuple(counts), n - 1)
+        table = {start: 0}
+        frontier = deque([start])
+        while frontier:
+            state = frontier.popleft()
+            counts, blank = state
+            for row in (blank - 1, blank + 1):
+                if not 0 <= row < n:
+                    continue
+                for goal_row in range(n):
+                    if counts[row * n + goal_row]:
+                        child = list(counts)
+                        child[row * n + goal_row] -= 1
+                        child[blank * n + goal_row] += 1
+                        child = (tuple(child), row)
+                        if child not in table:
+                            table[child] = table[state] + 1
+                            frontier.append(child)
+        WALKING_DISTANCE_TABLES[n] = table
+    return WALKING_DISTANCE_TABLES[n]
+
+def walking_distance_heuristic(n):
+    table = walking_distance_table(n)
+    shifts = SHIFTS[:n * n]
+
+    def walking_distance(code):
+        rows = [0] * (n * n)
+        cols = [0] * (n * n)
+        for position, shift in enumerate(shifts):
+            tile = (code >> shift) & 15
+            row, col = divmod(position, n)
+            if tile:
+                goal_row, goal_col = divmod(tile - 1, n)
+                rows[row * n + goal_row] += 1
+                cols[col * n + goal_col] += 1
+            else:
+                blank_row, blank_col = row, col
+        return table[(tuple(rows), blank_row)] + table[(tuple(cols), blank_col)]
+    return walking_distance
+
+def linear_conflict_heuristic(n):
+    costs = tile_cost_table(manhattan_cost, n)
+    rows, cols = linear_conflict_tables(n)
+    shifts = SHIFTS[:n * n]
+    row_mask = (1 << (4 * n)) - 1
+
+    def linear_conflict(code):
+        tiles = [(code >> shift) & 15 for shift in shifts]
+        distance = sum(costs[tile][position] for position, tile in enumerate(tiles))
+        conflicts = 0
+        for line in range(n):
+            conflicts += rows[line][(code >> (4 * n * line)) & row_mask]
+            key = 0
+            for row in range(n):
+                key |= tiles[row * n + line] << (4 * row)
+            conflicts += cols[line][key]
+        return distance + 2 * conflicts
+    return linear_conflict
+
+def combined_heuristic(*h_funcs):
+    # O máximo de heurísticas admissíveis continua admissível
+    return lambda code: max(h_func(code) for h_func in h_funcs)
+
+class Heuristic:
+    # Heurísticas por peça informam tile_cost e ganham atualização
+    # incremental na busca; as demais informam build(n) -> h(código).
+    def __init__(self, name, build=None, tile_cost=None, integer=True, sizes=(2, 3, 4)):
+        self.name = name
+        self.build = build
+        self.tile_cost = tile_cost
+        self.integer = integer
+        self.sizes = sizes
+
+    def make(self, n):
+        # Devolve (h_func, tile_costs); tile_costs é None fora das heurísticas por peça
+        if self.tile_cost is not None:
+            costs = tile_cost_table(self.tile_cost, n)
+            return tile_heuristic(costs, n), costs
+        return self.build(n), None
+
+HEURISTICS = {}
+
+def register_heuristic(heuristic):
+    HEURISTICS[heuristic.name] = heuristic
+    return heuristic
+
+def heuristic_names(n=None):
+    return [name for name, heuristic in HEURISTICS.items() if n is None or n in heuristic.sizes]
+
+def get_heuristic(name, n=3):
+    heuristic = HEURISTICS.get(name)
+    if heuristic is None:
+        raise ValueError(f"Heurística desconhecida: {name}")
+    if n not in heuristic.sizes:
+        raise ValueError(f"A heurística {name} não existe para o {n}x{n}")
+    return heuristic
+
+def distance_table_heuristic(n):
+    from distance_table import packed_distance
+    return packed_distance
+
+register_heuristic(Heuristic("Manhattan", tile_cost=manhattan_cost))
+register_heuristic(Heuristic("Distância Euclidiana", tile_cost=euclidean_cost, integer=False))
+register_heuristic(Heuristic("Conflito Linear", linear_conflict_heuristic))
+register_heuristic(Heuristic("Walking Distance", walking_distance_heuristic))
+register_heuristic(Heuristic("Walking Distance + Conflito Linear",
+                             lambda n: combined_heuristic(walking_distance_heuristic(n), linear_conflict_heuristic(n))))
+register_heuristic(Heuristic("Tabela", distance_table_heuristic, sizes=(3,)))
+
+def search_bfs(start, zero, stats, n=3):
+    goal_code = goal_code_for(n)
+    neighbors = neighbors_for(n)
+    came_from = {start: -1}
+    frontier = deque([(start, zero)])
+    while frontier:
+        code, zero = frontier.popleft()
+        if code == goal_code:
+            return unwind(came_from, code, zero, n)
+        stats.expanded += 1
+        if stats.expanded >= stats.next_check:
+            stats.check()
+        for neighbor, move in neighbors[zero]:
+            child = move_blank(code, zero, neighbor)
+            stats.generated += 1
+            if child in came_from:
+                stats.duplicates += 1
+                continue
+            came_from[child] = move
+            frontier.append((child, neighbor))
+        if len(frontier) > stats.peak_frontier:
+            stats.peak_frontier = len(frontier)
+    return None
+
+def search_bidirectional(start, zero, stats, n=3):
+    goal_code = goal_code_for(n)
+    if start == goal_code:
+        return []
+    neighbors = neighbors_for(n)
+    forward = {start: -1}
+    backward = {goal_code: -1}
+    forward_layer = [(start, zero)]
+    backward_layer = [(goal_code, goal_for(n).index(0))]
+    while forward_layer and backward_layer:
+        # Expande sempre a camada menor; o primeiro encontro já é ótimo
+        if len(forward_layer) <= len(backward_layer):
+            came_from, other, layer = forward, backward, forward_layer
+        else:
+            came_from, other, layer = backward, forward, backward_layer
+        next_layer = []
+        for code, zero in layer:
+            stats.expanded += 1
+            if stats.expanded >= stats.next_check:
+                stats.check()
+            for neighbor, move in neighbors[zero]:
+                child = move_blank(code, zero, neighbor)
+                stats.generated += 1
+                if child in came_from:
+                    stats.duplicates += 1
+                    continue
+                came_from[child] = move
+                if child in other:
+                    head = unwind(forward, child, neighbor, n)
+                    tail = unwind(backward, child, neighbor, n)
+                    return head + [move ^ 1 for move in reversed(tail)]
+                next_layer.append((child, neighbor))
+        if came_from is forward:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+        stats.peak_frontier = max(stats.peak_frontier, len(forward_layer) + len(backward_layer))
+    return None
+
+class BucketQueue:
+    # Fila para prioridades inteiras pequenas: um balde por valor de f,
+    # subdividido por g, e um ponteiro para o menor balde não vazio. Dentro
+    # do mesmo f sai primeiro o nó mais fundo (maior g).
+    def __init__(self):
+        self.buckets = []
+        self.counts = []
+        self.deepest = []
+        self.minimum = 0
+        self.size = 0
+
+    def push(self, entry):
+        priority, g = entry[0], entry[3]
+        buckets = self.buckets
+        while len(buckets) <= priority:
+            buckets.append([])
+            self.counts.append(0)
+            self.deepest.append(-1)
+        bucket = buckets[priority]
+        while len(bucket) <= g:
+            bucket.append([])
+        bucket[g].append(entry)
+        self.counts[priority] += 1
+        if g > self.deepest[priority]:
+            self.deepest[priority] = g
+        if priority < self.minimum:
+            self.minimum = priority
+        self.size += 1
+
+    def pop(self):
+        counts = self.counts
+        minimum = self.minimum
+        while not counts[minimum]:
+            minimum += 1
+        self.minimum = minimum
+        bucket = self.buckets[minimum]
+        g = self.deepest[minimum]
+        while not bucket[g]:
+            g -= 1
+        self.deepest[minimum] = g
+        counts[minimum] -= 1
+        self.size -= 1
+        return bucket[g].pop()
+
+    def __len__(self):
+        return self.size
+
+class HeapQueue:
+    # Para prioridades fracionárias (Euclidiana, pesos não inteiros); em
+    # empate de prioridade sai o maior g, como na BucketQueue
+    def __init__(self):
+        self.heap = []
+
+    def push(self, entry):
+        heapq.heappush(self.heap, (entry[0], -entry[3], entry))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[2]
+
+    def __len__(self):
+        return len(self.heap)
+
+def search_best_first(start, zero, h_func, stats, greedy=False, n=3, tile_costs=None, weight=1, cost_limit=math.inf, integer=True):
+    goal_code = goal_code_for(n)
+    neighbors = neighbors_for(n)
+    came_from = {}
+    g_score = {start: 0}
+    timing = stats.timing
+    h = h_func(start)
+    if integer and weight == int(weight):
+        weight = int(weight)
+        frontier = BucketQueue()
+    else:
+        frontier = HeapQueue()
+    push, pop = frontier.push, frontier.pop
+    push((h, start, zero, 0, h, -1))
+    while frontier:
+        _, code, zero, g, h, move = pop()
+        if code in came_from:
+            stats.duplicates += 1
+            continue
+        came_from[code] = move
+        if code == goal_code:
+            return unwind(came_from, code, zero, n)
+        stats.expanded += 1
+        if stats.expanded >= stats.next_check:
+            stats.check()
+        g += 1
+        if g + h - 1 >= cost_limit:
+            continue
+        for neighbor, move in neighbors[zero]:
+            tile = (code >> SHIFTS[neighbor]) & 15
+            child = code ^ (tile << SHIFTS[neighbor]) ^ (tile << SHIFTS[zero])
+            stats.generated += 1
+            if child in came_from:
+                stats.duplicates += 1
+                continue
+            if not greedy:
+                if g >= g_score.get(child, g + 1):
+                    stats.duplicates += 1
+                    continue
+                g_score[child] = g
+            if tile_costs is None:
+                child_h = h_func(child)
+            elif timing:
+                # A atualização incremental também conta como tempo de heurística
+                started = time.perf_counter()
+                costs = tile_costs[tile]
+                child_h = h - costs[neighbor] + costs[zero]
+                stats.heuristic_time += time.perf_counter() - started
+            else:
+                costs = tile_costs[tile]
+                child_h = h - costs[neighbor] + costs[zero]
+            if g + child_h >= cost_limit:
+                continue
+            push((child_h if greedy else g + weight * child_h, child, neighbor, g, child_h, move))
+        if len(frontier) > stats.peak_frontier:
+            stats.peak_frontier = len(frontier)
+    return None
+
+def search_anytime(start, zero, h_func, stats, n=3, tile_costs=None, weight=3.0, step=0.5, integer=True):
+    # A* ponderado repetido com peso decrescente. Cada passada só aceita
+    # caminhos mais curtos que o melhor atual; ao terminar uma passada com
+    # peso w, a solução guardada custa no máximo w vezes a ótima.
+    best = None
+    try:
+        while True:
+            cost_limit = math.inf if best is None else len(best)
+            moves = search_best_first(start, zero, h_func, stats, n=n, tile_costs=tile_costs, weight=weight, cost_limit=cost_limit, integer=integer)
+            if moves is not None:
+                best = moves
+            stats.bound = weight
+            if stats.callback is not None:
+                stats.callback(stats)
+            if weight <= 1:
+                return best
+            weight = max(1.0, weight - step)
+    except BudgetExhausted:
+        if best is None:
+            raise
+        return best
+
+def search_ida(start, zero, pdb, stats, n=3):
+    # Aprofundamento iterativo: só o caminho atual fica em memória.
+    board = unpack(start, n)
+    goal = goal_for(n)
+    neighbors = neighbors_for(n)
+    tables, slots = pdb.tables, pdb.slots
+    indices = pdb.indices(board)
+    moves = []
+    timing = stats.timing
+
+    def dfs(zero, g, h, bound, last):
+        f = g + h
+        if f > bound:
+            return f
+        if h == 0 and board == goal:
+            return -1
+        stats.expanded += 1
+        if stats.expanded >= stats.next_check:
+            stats.check()
+        minimum = math.inf
+        for neighbor, move in neighbors[zero]:
+            if move == last ^ 1:
+                continue
+            stats.generated += 1
+            if timing:
+                started = time.perf_counter()
+            tile = board[neighbor]
+            p, shift = slots[tile]
+            old = indices[p]
+            new = old + ((zero - neighbor) << shift)
+            child_h = h - tables[p][old] + tables[p][new]
+            if timing:
+                stats.heuristic_time += time.perf_counter() - started
+            board[zero], board[neighbor] = tile, 0
+            indices[p] = new
+            moves.append(move)
+            if len(moves) > stats.peak_frontier:
+                stats.peak_frontier = len(moves)
+            t = dfs(neighbor, g + 1, child_h, bound, move)
+            if t < 0:
+                return t
+            moves.pop()
+            board[zero], board[neighbor] = 0, tile
+            indices[p] = old
+            if t < minimum:
+                minimum = t
+        return minimum
+
+    bound = pdb.value(indices)
+    while bound < math.inf:
+        bound = dfs(zero, 0, pdb.value(indices), bound, -2)
+        if bound < 0:
+            return moves
+    return None
+
+def index_to_move(i1, i2, n=3):
     diff = i2 - i1
-    if diff == -3: return "up"
-    if diff == 3: return "down"
+    if diff == -n: return "up"
+    if diff == n: return "down"
     if diff == -1: return "left"
     if diff == 1: return "right"
 
 def manhattan(state):
-    distance = 0
-    for i, tile in enumerate(state):
-        if tile == 0:
-            continue
-        goal_index = GOAL.index(tile)
-        distance += abs(i // 3 - goal_index // 3) + abs(i % 3 - goal_index % 3)
-    return distance
+    n = board_size(state)
+    costs = tile_cost_table(manhattan_cost, n)
+    return sum(costs[tile][i] for i, tile in enumerate(state))
 
 def euclidean(state):
-    distance = 0
-    for i, tile in enumerate(state):
-        if tile == 0:
-            continue
-        goal_index = GOAL.index(tile)
-        dx = (i % 3) - (goal_index % 3)
-        dy = (i // 3) - (goal_index // 3)
-        distance += math.sqrt(dx*dx + dy*dy)
-    return distance
+    n = board_size(state)
+    costs = tile_cost_table(euclidean_cost, n)
+    return sum(costs[tile][i] for i, tile in enumerate(state))
 
 def apply_move(state, move):
+    n = board_size(state)
     state = list(state)
     zero_index = state.index(0)
 
-    if move == "up" and zero_index >= 3:
-        swap_with = zero_index - 3
-    elif move == "down" and zero_index <= 5:
-        swap_with = zero_index + 3
-    elif move == "left" and zero_index % 3 != 0:
+    if move == "up" and zero_index >= n:
+        swap_with = zero_index - n
+    elif move == "down" and zero_index < n * (n - 1):
+        swap_with = zero_index + n
+    elif move == "left" and zero_index % n != 0:
         swap_with = zero_index - 1
-    elif move == "right" and zero_index % 3 != 2:
+    elif move == "right" and zero_index % n != n - 1:
         swap_with = zero_index + 1
     else:
         return state
@@ -69,61 +703,101 @@ def reconstruct_path(start_flat, path):
         states.append(current[:])
     return [to_grid(state) for state in states]
 
+def iter_states(start_flat, moves):
+    # Gera um estado por vez (lista plana) em vez de montar todas as grades
+    n = board_size(start_flat)
+    deltas = move_deltas(n)
+    state = list(start_flat)
+    zero = state.index(0)
+    yield state[:]
+    for move in moves:
+        neighbor = zero + deltas[move]
+        state[zero], state[neighbor] = state[neighbor], 0
+        zero = neighbor
+        yield state[:]
+
 def to_grid(state):
-    return [state[i:i+3] for i in range(0, 9, 3)]
+    n = board_size(state)
+    return [state[i:i+n] for i in range(0, n * n, n)]
 
-def resolucao(start_state, algoritmo="A*", heuristica="Manhattan"):
-    flat_start = sum(start_state, []) 
-    start = tuple(flat_start)
-    visited = set()
-    g_score = {start: 0}
+def solve(flat_start, algoritmo="A*", heuristica="Manhattan", stats=None, cache=None, time_budget=None, node_budget=None):
+    # Devolve a lista de movimentos (índices de MOVE_NAMES); tabuleiros
+    # inválidos ou sem solução são recusados antes de qualquer busca.
     if heuristica is None:
         heuristica = "Manhattan"
+    validate_board(flat_start)
+    if not is_solvable(flat_start):
+        raise UnsolvableBoard("tabuleiro sem solução (paridade ímpar)")
+    if cache is not None and time_budget is None and node_budget is None:
+        from solution_cache import MISS
+        moves = cache.get(flat_start, algoritmo, heuristica)
+        if moves is MISS:
+            moves = solve(flat_start, algoritmo, heuristica, stats)
+            cache.put(flat_start, algoritmo, heuristica, moves)
+        elif stats is not None:
+            stats.cached = True
+            stats.depth = None if moves is None else len(moves)
+        return moves
 
-    if heuristica.lower() == "euclidiana":
-        h_func = euclidean
-    else:
-        h_func = manhattan
+    if stats is None:
+        stats = SearchStats()
+    if time_budget is not None:
+        stats.deadline = time.perf_counter() + time_budget
+    stats.node_budget = node_budget
+    if node_budget is not None:
+        stats.next_check = min(stats.next_check, node_budget)
+    tracing = stats.memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        moves = run_search(flat_start, algoritmo, heuristica, stats)
+    finally:
+        stats.wall_time += time.perf_counter() - started
+        if tracing:
+            stats.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    stats.depth = None if moves is None else len(moves)
+    return moves
 
-    h_start = h_func(start)
+def run_search(flat_start, algoritmo, heuristica, stats):
+    n = board_size(flat_start)
+    start = pack(flat_start)
+    zero = flat_start.index(0)
+    if algoritmo not in ALGORITHMS:
+        raise ValueError(f"Algoritmo desconhecido: {algoritmo}")
+    if n != 3 and algoritmo == "Tabela":
+        raise ValueError("A tabela de distâncias só existe para o 3x3")
 
     if algoritmo == "Largura":
-        frontier = deque([(start, [])])
-    else:
-        frontier = []
-        priority = h_start if algoritmo == "Busca Gulosa" else g_score[start] + h_start
-        heapq.heappush(frontier, (priority, start, []))
-
-    while frontier:
-        if algoritmo == "Largura":
-            state, path = frontier.popleft()
-        else:
-            _, state, path = heapq.heappop(frontier)
-
-        if list(state) == GOAL:
-            return reconstruct_path(flat_start, path)
-
-        visited.add(state)
-        zero_index = state.index(0)
+        return search_bfs(start, zero, stats, n)
+    elif algoritmo == "Largura Bidirecional":
+        return search_bidirectional(start, zero, stats, n)
+    elif algoritmo == "Tabela":
+        from distance_table import descend
+        moves = descend(flat_start)
+        stats.expanded += len(moves)
+        return moves
+    elif algoritmo == "IDA*":
+        import pattern_db
+        return search_ida(start, zero, pattern_db.for_size(n), stats, n)
 
-        for neighbor in MOVES[zero_index]:
-            new_state = list(state)
-            new_state[zero_index], new_state[neighbor] = new_state[neighbor], new_state[zero_index]
-            new_tuple = tuple(new_state)
-
-            if new_tuple in visited:
-                continue
-
-            move = index_to_move(zero_index, neighbor)
-            new_path = path + [move]
-
-            if algoritmo == "Largura":
-                frontier.append((new_tuple, new_path))
-            else:
-                g = g_score[state] + 1
-                h = h_func(new_tuple)
-                g_score[new_tuple] = g
-                priority = h if algoritmo == "Busca Gulosa" else g + h
-                heapq.heappush(frontier, (priority, new_tuple, new_path))
+    # Só as buscas informadas constroem a heurística (e suas tabelas)
+    heuristic = get_heuristic(heuristica, n)
+    h_func, tile_costs = heuristic.make(n)
+    if stats.timing:
+        h_func = stats.timed(h_func)
+    if algoritmo == "A* Anytime":
+        return search_anytime(start, zero, h_func, stats, n, tile_costs, integer=heuristic.integer)
+    else:
+        return search_best_first(start, zero, h_func, stats, greedy=algoritmo == "Busca Gulosa", n=n, tile_costs=tile_costs, integer=heuristic.integer)
 
-    return []
\ No newline at end of file
+def resolucao(start_state, algoritmo="A*", heuristica="Manhattan", cache=None, stats=None, return_stats=False, time_budget=None, node_budget=None):
+    flat_start = sum(start_state, [])
+    if return_stats and stats is None:
+        stats = SearchStats(timing=True)
+    moves = solve(flat_start, algoritmo, heuristica, stats, cache, time_budget, node_budget)
+    path = [] if moves is None else reconstruct_path(flat_start, [MOVE_NAMES[move] for move in moves])
+    if return_stats:
+        return path, stats
+    return path
\ No newline at end of file
@@ -2,6 +2,7 @@ import pygame
 import tkinter as tk
 from tkinter import filedialog
 from settings import WHITE, BLACK
+from fonts import get_font, render_lines
 
 # Função para selecionar imagem usando uma janela do sistema
 def selecionar_imagem():
@@ -24,7 +25,8 @@ class Button(pygame.sprite.Sprite):
         self.text_color = text_color
         self.image_icon = image
 
-        self.font = pygame.font.Font(None, 30)
+        self.font_size = 30
+        self.font = get_font(self.font_size)
         self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
         self.rect = self.image.get_rect(topleft=(self.x, self.y))
 
@@ -50,7 +52,7 @@ class Button(pygame.sprite.Sprite):
         y_offset = (self.height - len(lines) * self.font.get_height()) // 2
 
         for line in lines:
-            text_surface = self.font.render(line, True, self.text_color)
+            text_surface = render_lines(line, self.font_size, self.text_color)[0]
             text_rect = text_surface.get_rect(center=(self.width // 2, y_offset + self.font.get_height() // 2))
             self.image.blit(text_surface, text_rect)
             y_offset += self.font.get_height()
@@ -62,8 +64,7 @@ class Button(pygame.sprite.Sprite):
 
         for word in words:
             test_line = current_line + " " + word if current_line else word
-            test_surface = self.font.render(test_line, True, self.text_color)
-            if test_surface.get_width() <= max_width:
+            if self.font.size(test_line)[0] <= max_width:
                 current_line = test_line
             else:
                 if current_line:
@@ -91,8 +92,7 @@ class UIElement(pygame.sprite.Sprite):
         self.x = x
         self.y = y
         self.text = text
-        self.font = pygame.font.Font(None, 30)
-        self.image = self.font.render(self.text, True, BLACK)
+        self.image = render_lines(self.text, 30, BLACK)[0]
         self.rect = self.image.get_rect(topleft=(self.x, self.y))
 
     def draw(self, screen):
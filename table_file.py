@@ -0,0 +1,60 @@
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TABLES_DIR = os.path.join(BASE_DIR, "tables")
+
+# magic, versão, tamanho do tabuleiro, tamanho dos dados, crc32 dos dados
+HEADER = struct.Struct("<4sHHII")
+MAGIC = b"P8TB"
+VERSION = 1
+
+_loaded = {}
+
+class TableFileError(ValueError):
+    pass
+
+def table_path(name):
+    return os.path.join(TABLES_DIR, name + ".bin")
+
+def write_table(path, data, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    header = HEADER.pack(MAGIC, VERSION, size, len(data), zlib.crc32(data))
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def open_table(path, size, verify=True):
+    with open(path, "rb") as f:
+        # mmap recusa arquivos vazios com ValueError; confere o tamanho antes
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            raise TableFileError(f"{path}: arquivo truncado")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, board_size, length, checksum = HEADER.unpack_from(mapped)
+    if magic != MAGIC or version != VERSION:
+        raise TableFileError(f"{path}: formato desconhecido")
+    if board_size != size:
+        raise TableFileError(f"{path}: tabela para {board_size}x{board_size}, esperado {size}x{size}")
+    if len(mapped) != HEADER.size + length:
+        raise TableFileError(f"{path}: arquivo truncado")
+    data = memoryview(mapped)[HEADER.size:]
+    if verify and zlib.crc32(data) != checksum:
+        raise TableFileError(f"{path}: checksum inválido")
+    return data
+
+def load(name, size, build):
+    # Carrega a tabela sob demanda; se o arquivo não existir ou estiver
+    # corrompido, gera de novo e grava para os próximos processos.
+    if name not in _loaded:
+        path = table_path(name)
+        try:
+            _loaded[name] = open_table(path, size)
+        except (OSError, TableFileError):
+            write_table(path, build(), size)
+            _loaded[name] = open_table(path, size, verify=False)
+    return _loaded[name]